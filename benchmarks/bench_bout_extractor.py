@@ -0,0 +1,104 @@
+"""
+Parity and per-card throughput of BoutExtractor (precompiled lxml XPath) against the
+selector-based reference, EventPageParser.extract_bout_with_selectors.
+
+Every bout of every card is extracted both ways and compared field by field before anything
+is timed; any difference fails the run. The bundled cards are synthetic (see
+fixtures/manifest.json), so parity on them only shows both paths agree on markup written to
+the selectors. Pass captured event pages (benchmarks/capture_fixtures.py) to check real markup.
+
+Usage (from the repository root):
+    python benchmarks/bench_bout_extractor.py
+    python benchmarks/bench_bout_extractor.py --iterations 500 benchmarks/fixtures/tapology_event_ppv.html
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.http import HtmlResponse
+
+from ufc_scraper.parsers.bout_extractor import BoutExtractor
+from ufc_scraper.parsers.event_page_parser import EventPageParser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_CARDS = ["tapology_event_small.html", "tapology_event_ppv.html"]
+BOUT_SELECTOR = 'ul[data-event-view-toggle-target="list"] > li[data-controller="table-row-background"]'
+
+
+def card_source(path):
+    with open(os.path.join(FIXTURES_DIR, "manifest.json"), encoding="utf-8") as f:
+        files = json.load(f)["files"]
+    entry = files.get(os.path.basename(path)) if os.path.dirname(os.path.abspath(path)) == FIXTURES_DIR else None
+    return entry["source"] if entry else "given"
+
+
+def load_card(path):
+    with open(path, "rb") as f:
+        body = f.read()
+    return HtmlResponse(url="https://www.tapology.com/fightcenter/events/100000-ufc-fixture", body=body, encoding="utf-8")
+
+
+def extract_with_selectors(response):
+    fights = response.css(BOUT_SELECTOR)
+    return [EventPageParser.extract_bout_with_selectors(fight, response, len(fights) - index) for index, fight in enumerate(fights)]
+
+
+def extract_with_xpath(response):
+    fights = response.css(BOUT_SELECTOR)
+    return [BoutExtractor.extract(fight.root, response, len(fights) - index) for index, fight in enumerate(fights)]
+
+
+def check_parity(name, response):
+    expected = extract_with_selectors(response)
+    actual = extract_with_xpath(response)
+
+    if len(expected) != len(actual):
+        raise AssertionError(f"{name}: {len(expected)} bouts with selectors, {len(actual)} with BoutExtractor")
+
+    for index, (want, got) in enumerate(zip(expected, actual), start=1):
+        if want != got:
+            raise AssertionError(f"{name}: bout {index} differs\n  selectors: {want}\n  extractor: {got}")
+
+    return len(expected)
+
+
+def throughput(extract, response, iterations):
+    # Fresh responses would re-parse the HTML each time; reuse the parsed tree and only time extraction.
+    started = time.perf_counter()
+    for _ in range(iterations):
+        extract(response)
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cards", nargs="*", help="event page HTML files (default: bundled fixtures)")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = args.cards or [os.path.join(FIXTURES_DIR, name) for name in DEFAULT_CARDS]
+
+    sources = {}
+    print(f"{'card':<32} {'bouts':>5} {'selectors':>14} {'extractor':>14} {'speedup':>8}")
+    for path in paths:
+        name = os.path.basename(path)
+        response = load_card(path)
+        bouts = check_parity(name, response)
+        sources[name] = card_source(path)
+
+        baseline = throughput(extract_with_selectors, response, args.iterations)
+        engine = throughput(extract_with_xpath, response, args.iterations)
+        print(f"{name:<32} {bouts:>5} {baseline:>9.0f} c/s {engine:>9.0f} c/s {engine / baseline:>7.1f}x")
+
+    print("\nParity: all bouts identical.")
+    synthetic = [name for name, source in sources.items() if source == "synthetic"]
+    if synthetic:
+        print(f"Note: {', '.join(synthetic)} {'is' if len(synthetic) == 1 else 'are'} synthetic; parity says nothing about real pages.")
+
+
+if __name__ == "__main__":
+    main()
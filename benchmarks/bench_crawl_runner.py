@@ -0,0 +1,89 @@
+"""
+Cold vs warm invocation latency for the Lambda crawl path.
+
+Cold: one `scrapy crawl` subprocess per invocation (the old handler behaviour).
+Warm: one CrawlRunner per process, reused across invocations (the current handler).
+
+Usage (from the repository root, with Supabase credentials in .env):
+    python benchmarks/bench_crawl_runner.py --runs 5
+    python benchmarks/bench_crawl_runner.py --spider smart -a mode=live --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_spider_args(raw_args):
+    spider_args = {}
+    for raw in raw_args:
+        key, _, value = raw.partition("=")
+        spider_args[key] = value
+    return spider_args
+
+
+def run_cold(spider, spider_args, runs):
+    timings = []
+    for _ in range(runs):
+        command = [sys.executable, "-m", "scrapy", "crawl", spider, "--loglevel", "WARNING"]
+        for key, value in spider_args.items():
+            command += ["-a", f"{key}={value}"]
+
+        started = time.perf_counter()
+        subprocess.run(command, check=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_warm(spider, spider_args, runs):
+    started = time.perf_counter()
+    from scrapy.utils.project import get_project_settings
+    from ufc_scraper.services.crawl_runner import CrawlRunner
+
+    settings = get_project_settings()
+    settings.set("LOG_LEVEL", "WARNING", priority="cmdline")
+    runner = CrawlRunner(settings)
+    init_time = time.perf_counter() - started
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        runner.run(spider, **spider_args)
+        timings.append(time.perf_counter() - started)
+    return init_time, timings
+
+
+def describe(label, timings):
+    print(f"{label:<22} n={len(timings):<3} "
+          f"min={min(timings) * 1000:8.1f}ms "
+          f"median={statistics.median(timings) * 1000:8.1f}ms "
+          f"max={max(timings) * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spider", default="smart")
+    parser.add_argument("-a", dest="spider_args", action="append", default=[], help="spider argument as key=value")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    spider_args = parse_spider_args(args.spider_args) or {"mode": "live"}
+
+    cold = run_cold(args.spider, spider_args, args.runs)
+    init_time, warm = run_warm(args.spider, spider_args, args.runs)
+
+    print(f"\nSpider: {args.spider} {spider_args}")
+    describe("cold (subprocess)", cold)
+    print(f"{'warm runner init':<22} {init_time * 1000:8.1f}ms")
+    describe("warm (first call)", warm[:1])
+    if len(warm) > 1:
+        describe("warm (reused)", warm[1:])
+        print(f"\nSpeedup (cold median / warm median): {statistics.median(cold) / statistics.median(warm[1:]):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
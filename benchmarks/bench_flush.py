@@ -0,0 +1,143 @@
+"""
+Flush wall-time of DatabasePipeline versus upsert chunk size and concurrency.
+
+Runs against a local PostgREST stand-in: a threaded HTTP server that answers
+POST /rest/v1/<table> after a simulated latency of `--base-latency` plus
+`--row-latency` per row, so the effect of chunking and concurrency can be
+measured without a real database.
+
+Usage (from the repository root):
+    python benchmarks/bench_flush.py
+    python benchmarks/bench_flush.py --events 300 --chunk-sizes 0,100,250,500 --concurrency 1,4,8
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class PostgrestStandIn(BaseHTTPRequestHandler):
+    base_latency = 0.05
+    row_latency = 0.0002
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        rows = json.loads(body or b"[]")
+        time.sleep(self.base_latency + self.row_latency * len(rows))
+
+        payload = json.dumps(rows).encode("utf-8")
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PostgrestStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_items(event_count, bouts_per_event):
+    items = []
+    for event_number in range(event_count):
+        event_id = str(100000 + event_number)
+        items.append({"item_type": "event", "event_id": event_id, "name": f"UFC {event_number}", "status": "Completed"})
+
+        for bout in range(bouts_per_event):
+            fight_id = f"{event_id}{bout:02d}"
+            items.append({
+                "item_type": "fight", "fight_id": fight_id, "event_id": event_id,
+                "method_type": "Decision", "method_detail": "Unanimous", "round_summary": "R3 5:00",
+                "bout_type": "Main Card", "weight_class_lbs": "155", "weight_class_id": "LW",
+                "rounds_format": "3 x 5", "fight_order": str(bout + 1),
+            })
+            for corner in range(2):
+                fighter_id = f"{fight_id}{corner}"
+                items.append({
+                    "item_type": "fighter", "fighter_id": fighter_id, "name": f"Fighter {fighter_id}",
+                    "profile_url": f"https://www.tapology.com/fightcenter/fighters/{fighter_id}", "image_url": None,
+                })
+                items.append({
+                    "item_type": "participation", "fight_id": fight_id, "fighter_id": fighter_id,
+                    "odds_value": -150, "odds_label": "Slight Favorite", "result": "win" if corner == 0 else "loss",
+                    "record_after_fight": {"wins": 10, "losses": 2, "draws": 0}, "is_red_corner": None,
+                })
+    return items
+
+
+async def measure_flush(items, chunk_size, concurrency):
+    from ufc_scraper.pipelines import DatabasePipeline
+
+    pipeline = DatabasePipeline(upsert_chunk_size=chunk_size, upsert_concurrency=concurrency)
+    pipeline.flush_lock = asyncio.Lock()
+    for item in items:
+        await pipeline.process_item(dict(item), None)
+
+    started = time.perf_counter()
+    await pipeline._flush_all()
+    return time.perf_counter() - started
+
+
+async def run_grid(items, chunk_sizes, concurrencies):
+    results = {}
+    for chunk_size in chunk_sizes:
+        for concurrency in concurrencies:
+            # Concurrency has no effect on a single unbounded request
+            if chunk_size == 0 and concurrency > 1:
+                continue
+            results[(chunk_size, concurrency)] = await measure_flush(items, chunk_size, concurrency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--bouts", type=int, default=13)
+    parser.add_argument("--chunk-sizes", default="0,100,250,500,1000")
+    parser.add_argument("--concurrency", default="1,2,4,8")
+    parser.add_argument("--base-latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--row-latency", type=float, default=0.0002, help="seconds per row")
+    args = parser.parse_args()
+
+    PostgrestStandIn.base_latency = args.base_latency
+    PostgrestStandIn.row_latency = args.row_latency
+    server = start_stand_in()
+
+    os.environ["SUPABASE_PROD_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["SUPABASE_PROD_KEY"] = "benchmark.anon.key"
+
+    items = build_items(args.events, args.bouts)
+    print(f"Flushing {len(items)} rows ({args.events} events x {args.bouts} bouts) "
+          f"with {args.base_latency * 1000:.0f}ms/request + {args.row_latency * 1000:.2f}ms/row\n")
+
+    chunk_sizes = [int(value) for value in args.chunk_sizes.split(",")]
+    concurrencies = [int(value) for value in args.concurrency.split(",")]
+
+    # One event loop for the whole grid: the shared Supabase client is bound to it.
+    results = asyncio.run(run_grid(items, chunk_sizes, concurrencies))
+
+    print(f"{'chunk size':>10} " + " ".join(f"{f'c={c}':>10}" for c in concurrencies))
+    for chunk_size in chunk_sizes:
+        label = "unbounded" if chunk_size == 0 else str(chunk_size)
+        cells = []
+        for concurrency in concurrencies:
+            timing = results.get((chunk_size, concurrency))
+            cells.append(f"{timing * 1000:>8.0f}ms" if timing is not None else f"{'-':>10}")
+        print(f"{label:>10} " + " ".join(cells))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
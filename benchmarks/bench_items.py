@@ -0,0 +1,190 @@
+"""
+Item stream cost: dict-backed scrapy.Items versus the slotted rows ItemFactory builds.
+
+Builds a backfill-sized stream (per bout one fight, two fighters and two participations,
+plus one event per card) both ways, the Items field by field like the old ItemFactory, then
+feeds it through DatabasePipeline.process_item. Reports per variant:
+  - build and pipeline throughput (items/sec)
+  - memory held by the built stream, and the peak while building + buffering it
+
+No request is sent: buffered rows are dropped instead of flushed.
+
+Usage (from the repository root):
+    python benchmarks/bench_items.py
+    python benchmarks/bench_items.py --events 2000 --bouts 14
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_PROD_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_PROD_KEY", "benchmark.anon.key")
+
+import scrapy
+
+from ufc_scraper.items import FighterItem
+from ufc_scraper.utils.item_factory import ItemFactory
+from ufc_scraper.pipelines import DatabasePipeline
+
+
+# The dict-backed Items the card parsers yielded before the slotted rows, kept here for comparison.
+
+class EventItem(scrapy.Item):
+    item_type = scrapy.Field()
+    event_id = scrapy.Field()  # PK
+    event_url = scrapy.Field()
+    status = scrapy.Field()
+    name = scrapy.Field()
+    datetime_utc = scrapy.Field()
+    venue = scrapy.Field()
+    location = scrapy.Field()
+
+
+class FightItem(scrapy.Item):
+    item_type = scrapy.Field()
+    fight_id = scrapy.Field()  # PK
+    event_id = scrapy.Field()  # FK -> EventItem
+    method_type = scrapy.Field()
+    method_detail = scrapy.Field()
+    round_summary = scrapy.Field()
+    bout_type = scrapy.Field()
+    weight_class_lbs = scrapy.Field()
+    weight_class_id = scrapy.Field()
+    rounds_format = scrapy.Field()
+    fight_order = scrapy.Field()
+
+
+class FightParticipationItem(scrapy.Item):
+    item_type = scrapy.Field()
+    fight_id = scrapy.Field()  # FK -> FightItem
+    fighter_id = scrapy.Field()  # FK -> FighterItem
+    odds_value = scrapy.Field()
+    odds_label = scrapy.Field()
+    result = scrapy.Field()
+    record_after_fight = scrapy.Field()
+    is_red_corner = scrapy.Field()
+
+
+def card_data(event_number, bouts):
+    event_id = str(100000 + event_number)
+    card = []
+    for bout in range(bouts):
+        fight_id = f"{event_id}{bout:02d}"
+        fighters = [{
+            "fighter_id": f"{fight_id}{corner}", "name": f"Fighter {fight_id}{corner}",
+            "profile_url": f"https://www.tapology.com/fightcenter/fighters/{fight_id}{corner}", "image_url": None,
+            "result": "win" if corner == 0 else "loss", "record_after_fight": {"wins": 10, "losses": 2, "draws": 0}, "is_red_corner": None,
+        } for corner in range(2)]
+        metadata = {
+            "fight_id": fight_id, "bout_type": "Main Card", "weight_class_lbs": "155", "weight_class_id": "LW",
+            "rounds_format": "3 x 5", "fight_order": str(bout + 1),
+        }
+        summary = {"method_type": "Decision", "method_detail": "Unanimous", "round_summary": "R3 5:00"}
+        odds = {"fighter1_odds_value": -150, "fighter1_odds_label": "Slight Favorite",
+                "fighter2_odds_value": 130, "fighter2_odds_label": "Slight Underdog"}
+        card.append((metadata, summary, fighters, odds))
+    return event_id, card
+
+
+def build_rows(event_id, card):
+    items = [ItemFactory.create_event_item(event_id, f"https://www.tapology.com/fightcenter/events/{event_id}",
+                                           f"UFC {event_id}", "Completed", "2024-01-01T00:00:00+00:00", "Venue", "Location")]
+    for metadata, summary, fighters, odds in card:
+        items.append(ItemFactory.create_fight_item(metadata, event_id, summary))
+        items.extend(ItemFactory.create_fighter_items(fighters[0], fighters[1]))
+        items.extend(ItemFactory.create_participation_items(metadata["fight_id"], fighters[0], fighters[1], odds))
+    return items
+
+
+def build_items(event_id, card):
+    # The previous ItemFactory: dict-backed Items filled one field at a time.
+    event = EventItem()
+    event["item_type"] = "event"
+    event["event_id"] = event_id
+    event["event_url"] = f"https://www.tapology.com/fightcenter/events/{event_id}"
+    event["name"] = f"UFC {event_id}"
+    event["status"] = "Completed"
+    event["datetime_utc"] = "2024-01-01T00:00:00+00:00"
+    event["venue"] = "Venue"
+    event["location"] = "Location"
+    items = [event]
+
+    for metadata, summary, fighters, odds in card:
+        fight = FightItem()
+        fight["item_type"] = "fight"
+        fight["fight_id"] = metadata["fight_id"]
+        fight["event_id"] = event_id
+        for key in ("method_type", "method_detail", "round_summary"):
+            fight[key] = summary.get(key)
+        for key in ("bout_type", "weight_class_lbs", "weight_class_id", "rounds_format", "fight_order"):
+            fight[key] = metadata.get(key)
+        items.append(fight)
+
+        for fighter_data in fighters:
+            fighter = FighterItem()
+            fighter["item_type"] = "fighter"
+            for key in ("fighter_id", "name", "profile_url", "image_url"):
+                fighter[key] = fighter_data.get(key)
+            items.append(fighter)
+
+        for corner, fighter_data in enumerate(fighters, start=1):
+            participation = FightParticipationItem()
+            participation["item_type"] = "participation"
+            participation["fight_id"] = metadata["fight_id"]
+            participation["fighter_id"] = fighter_data.get("fighter_id")
+            participation["odds_value"] = odds.get(f"fighter{corner}_odds_value")
+            participation["odds_label"] = odds.get(f"fighter{corner}_odds_label")
+            participation["result"] = fighter_data.get("result")
+            participation["record_after_fight"] = fighter_data.get("record_after_fight")
+            participation["is_red_corner"] = fighter_data.get("is_red_corner")
+            items.append(participation)
+    return items
+
+
+def measure(builder, cards):
+    tracemalloc.start()
+
+    started = time.perf_counter()
+    stream = [item for event_id, card in cards for item in builder(event_id, card)]
+    build_time = time.perf_counter() - started
+    stream_bytes = tracemalloc.get_traced_memory()[0]
+
+    pipeline = DatabasePipeline()
+    loop = asyncio.new_event_loop()
+
+    async def feed():
+        for item in stream:
+            await pipeline.process_item(item, None)
+
+    started = time.perf_counter()
+    loop.run_until_complete(feed())
+    pipeline_time = time.perf_counter() - started
+    loop.close()
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(stream), build_time, pipeline_time, stream_bytes, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--bouts", type=int, default=13)
+    args = parser.parse_args()
+
+    cards = [card_data(event_number, args.bouts) for event_number in range(args.events)]
+
+    print(f"{'variant':<14} {'items':>8} {'build/s':>10} {'pipeline/s':>11} {'stream':>10} {'peak':>10}")
+    for label, builder in (("scrapy.Item", build_items), ("slotted rows", build_rows)):
+        count, build_time, pipeline_time, stream_bytes, peak = measure(builder, cards)
+        print(f"{label:<14} {count:>8} {count / build_time:>10.0f} {count / pipeline_time:>11.0f} "
+              f"{stream_bytes / 1024 / 1024:>8.1f}MB {peak / 1024 / 1024:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Normalizer versus the original utils parsers: parity and per-call cost.
+
+For each parser, a corpus of raw strings (Tapology's formats plus the odd inputs the
+fallback has to handle) is run through both, and every result must be identical; the
+run exits with status 1 on any mismatch. Timings are reported per parser:
+  - original: the utils parser on every call
+  - cold: Normalizer with an empty cache, each distinct value once (fast path + fallback)
+  - warm: Normalizer over a stream with crawl-like repetition
+
+Usage (from the repository root):
+    python benchmarks/bench_normalization.py
+    python benchmarks/bench_normalization.py --repeat 50
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ufc_scraper.utils.normalization import Normalizer
+from ufc_scraper.utils.datetime_parser import DatetimeParser
+from ufc_scraper.utils.date_parser import DateParser
+from ufc_scraper.utils.record_parser import RecordParser
+from ufc_scraper.utils.measurement_parser import MeasurementParser
+from ufc_scraper.utils.round_parser import RoundParser
+from ufc_scraper.utils.odds_parser import OddsParser
+
+
+def datetime_corpus():
+    values = []
+    start = datetime(2019, 1, 5, 0, 0)
+    # Every 61 hours for six years: all weekdays, both DST transitions and 12 AM / 12 PM.
+    for step in range(0, 6 * 365 * 24, 61):
+        moment = start + timedelta(hours=step)
+        values.append(moment.strftime("%A %m.%d.%Y at %I:%M %p ET"))
+    values += [
+        "Saturday 03.10.2024 at 02:30 AM ET",  # does not exist in New York
+        "Sunday 11.03.2024 at 01:30 AM ET",    # exists twice
+        "Saturday 09.28.2024 at 3:00 PM ET",
+        "09.28.2024 at 03:00 PM ET",
+        "Saturday 02.30.2024 at 03:00 PM ET",
+        "Saturday 09.28.2024 at 03:00 PM PT",
+        "Saturday, September 28, 2024",
+        "Saturday 09.28.2024",
+        "TBA",
+    ]
+    return values
+
+
+def date_corpus():
+    values = []
+    for year in (1975, 1988, 1992, 2000):
+        for month in range(1, 13):
+            for day in (1, 9, 19, 28, 29, 30, 31):
+                for fmt in ("%Y %b %d", "%Y %B %d", "%Y-%m-%d", "%d %b %Y", "%d %B %Y"):
+                    try:
+                        values.append(datetime(year, month, day).strftime(fmt))
+                    except ValueError:
+                        values.append(f"{year} {datetime(year, month, 1).strftime('%b')} {day}")
+    values += ["1987 Jul 7", "1987 jul 19", "1987  Jul 19", " 1987 Jul 19 ", "1987 Sept 19", "N/A", "n/a", "", "   ", "Unknown"]
+    return values
+
+
+def record_corpus():
+    values = [f"{wins}-{losses}-{draws}" for wins in range(0, 30, 3) for losses in range(0, 12, 2) for draws in range(3)]
+    values += [f"{wins}-{losses}" for wins in range(10) for losses in range(5)]
+    values += ["12-3-0, 1 NC", "20-5-0 (Win-Loss-Draw)", "N/A", "", "   ", "Amateur", None]
+    return values
+
+
+def measurement_corpus():
+    values = [f"{feet}'{inches}\" ({round((feet * 12 + inches) * 2.54)}cm)" for feet in (5, 6, 7) for inches in range(12)]
+    values += [f"{inches}.0\" ({round(inches * 2.54)}cm)" for inches in range(60, 86)]
+    values += ["N/A", "", "   ", "72\"", "6'0\"", None]
+    return values
+
+
+def round_corpus():
+    values = [f"{minute}:{second:02d} Round {round_number} of {rounds}"
+              for minute in range(5) for second in range(0, 60, 7) for round_number in range(1, 6) for rounds in (3, 5)]
+    values += ["3 Rounds, 15:00 Total", "5 Rounds, 25:00 Total", "1 Round", "Round 2 of 3", "round 1 of 5", "  0:48 Round 2 of 3 ", "No Contest", "", None]
+    return values
+
+
+def odds_corpus():
+    labels = ["Close", "Slight Favorite", "Slight Underdog", "Moderate Favorite", "Moderate Underdog", "Huge Favorite", "Huge Underdog"]
+    values = [f"{sign}{value} ({label})" for sign in "+-" for value in range(100, 1500, 35) for label in labels]
+    values += ["+150", "-110", "EVEN", "-110(Close)", " +125 (Slight Underdog) ", "", None, 150]
+    return values
+
+
+CASES = [
+    ("datetime", DatetimeParser.parse, Normalizer.datetime_utc, datetime_corpus),
+    ("date", DateParser.parse_date_to_iso, Normalizer.date_iso, date_corpus),
+    ("record", RecordParser.parse, Normalizer.record, record_corpus),
+    ("measurement", MeasurementParser.parse_measurement, Normalizer.measurement, measurement_corpus),
+    ("round_summary", RoundParser.standardize_round_summary, Normalizer.round_summary, round_corpus),
+    ("odds", OddsParser.split_odds, Normalizer.odds, odds_corpus),
+]
+
+
+def per_call_us(function, values):
+    started = time.perf_counter()
+    for value in values:
+        function(value)
+    return (time.perf_counter() - started) / len(values) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="times each distinct value recurs in the warm stream")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    mismatches = 0
+
+    print(f"{'parser':<14} {'values':>7} {'original':>10} {'cold':>10} {'warm':>10} {'speedup':>8}")
+    for label, original, normalizer, corpus in CASES:
+        values = corpus()
+
+        Normalizer.cache_clear()
+        for value in values:
+            expected, actual = original(value), normalizer(value)
+            if expected != actual:
+                mismatches += 1
+                print(f"  MISMATCH {label}: {value!r} -> {actual!r}, expected {expected!r}")
+
+        stream = values * args.repeat
+        rng.shuffle(stream)
+
+        original_us = per_call_us(original, stream)
+        Normalizer.cache_clear()
+        cold_us = per_call_us(normalizer, values)
+        warm_us = per_call_us(normalizer, stream)
+
+        print(f"{label:<14} {len(values):>7} {original_us:>8.2f}us {cold_us:>8.2f}us {warm_us:>8.2f}us {original_us / warm_us:>7.1f}x")
+
+    if mismatches:
+        print(f"\n{mismatches} results differ from the original parsers.")
+        sys.exit(1)
+    print("\nAll results match the original parsers.")
+
+
+if __name__ == "__main__":
+    main()
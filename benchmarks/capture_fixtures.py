@@ -0,0 +1,85 @@
+"""
+Refresh the benchmark fixtures from the live sites.
+
+Downloads one page per fixture and overwrites the file in benchmarks/fixtures, so the
+suite can be re-based on current markup. Pick pages that match each fixture's role
+(a small finished card, a large PPV card with cancelled bouts, ...).
+
+The bundled fixtures are synthetic (hand-written to the selectors). fixtures/manifest.json
+records where each file came from; a capture replaces its entry with the URL and time, and
+the fixture set is named after the capture once no synthetic file is left.
+
+Usage (from the repository root):
+    python benchmarks/capture_fixtures.py \\
+        --event-small https://www.tapology.com/fightcenter/events/... \\
+        --event-ppv https://www.tapology.com/fightcenter/events/... \\
+        --fighter https://www.tapology.com/fightcenter/fighters/...
+"""
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+import requests
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, "manifest.json")
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+FIXTURES = {
+    "event_small": ("tapology_event_small.html", None),
+    "event_ppv": ("tapology_event_ppv.html", None),
+    "fighter": ("tapology_fighter_profile.html", None),
+    "rankings": ("ufc_rankings.html", "https://www.ufc.com/rankings"),
+    "listing": ("tapology_promotion_listing.html", "https://www.tapology.com/fightcenter/promotions/1-ultimate-fighting-championship-ufc?page=1"),
+}
+
+
+def load_manifest():
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    sources = {entry["source"] for entry in manifest["files"].values()}
+    if "synthetic" not in sources:
+        captured = max(entry["captured_at"] for entry in manifest["files"].values())
+        manifest["fixture_set"] = f"captured-{captured[:10]}"
+    elif sources != {"synthetic"}:
+        manifest["fixture_set"] = "mixed"
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for key, (_, default_url) in FIXTURES.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, default=default_url)
+    parser.add_argument("--delay", type=float, default=2.0, help="seconds between requests")
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    for key, (filename, _) in FIXTURES.items():
+        url = getattr(args, key)
+        if not url:
+            print(f"Skipping {filename}: no URL given")
+            continue
+
+        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30)
+        response.raise_for_status()
+
+        with open(os.path.join(FIXTURES_DIR, filename), "wb") as f:
+            f.write(response.content)
+        manifest["files"][filename] = {"source": url, "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        save_manifest(manifest)
+        print(f"Saved {filename} ({len(response.content)} bytes) from {url}")
+
+        time.sleep(args.delay)
+
+    print(f"Fixture set: {manifest['fixture_set']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Offline parser benchmark suite.
+
+Replays the saved HTML fixtures in benchmarks/fixtures through the spider callbacks and
+parsers, with no network or database I/O, and reports per case:
+  - items/sec
+  - per-call latency percentiles (p50/p95/p99), HTML parsing included
+  - peak traced memory of a single call
+
+Each case is compared with benchmarks/parser_thresholds.json; the run exits with status 1
+when any threshold is exceeded. The thresholds file names the fixture set it was calibrated
+on (fixtures/manifest.json); after capturing new fixtures, re-calibrate with --calibrate,
+which rewrites the thresholds from this run with CALIBRATION_HEADROOM.
+
+Usage (from the repository root):
+    python benchmarks/run_parsers.py
+    python benchmarks/run_parsers.py --iterations 500 --only event_card_ppv
+    python benchmarks/run_parsers.py --thresholds my_thresholds.json --json results.json
+    python benchmarks/run_parsers.py --calibrate
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Spiders open a SupabaseManager on init; no request is ever sent during the benchmark.
+os.environ.setdefault("SUPABASE_PROD_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_PROD_KEY", "benchmark.anon.key")
+
+from scrapy.crawler import Crawler
+from scrapy.http import HtmlResponse
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.project import get_project_settings
+
+from ufc_scraper.parsers.event_page_parser import EventPageParser
+from ufc_scraper.parsers.cancelled_fight_parser import CancelledFightParser
+from ufc_scraper.spiders.fighter_spider import FighterSpider
+from ufc_scraper.spiders.ranking_spider import RankingSpider
+from ufc_scraper.spiders.smart_spider import SmartSpider
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+DEFAULT_THRESHOLDS = os.path.join(BENCHMARKS_DIR, "parser_thresholds.json")
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, "manifest.json")
+
+# --calibrate: limits are the measured value times this factor (divided, for the minimum rate),
+# leaving room for slower CI machines. Item counts must match exactly.
+CALIBRATION_HEADROOM = {"items_per_sec": 5, "p95_ms": 5, "peak_kib": 3}
+
+EVENT_URL = "https://www.tapology.com/fightcenter/events/100000-ufc-fixture"
+FIGHTER_URL = "https://www.tapology.com/fightcenter/fighters/3001-fixture"
+RANKINGS_URL = "https://www.ufc.com/rankings"
+LISTING_URL = "https://www.tapology.com/fightcenter/promotions/1-ultimate-fighting-championship-ufc?page=1"
+
+
+def run_parse_card(response):
+    return list(EventPageParser.parse_card(response, "100000", EVENT_URL))
+
+
+def run_cancelled_fights(response):
+    items = []
+    for cancelled_fight in response.xpath('//div[starts-with(@id, "bout") and contains(@id, "Cancelled")]'):
+        items.extend(CancelledFightParser.parse_cancelled_fight(cancelled_fight, response, "100000"))
+    return items
+
+
+def make_fighter_case():
+    spider = FighterSpider(fighter_id="3001", profile_url=FIGHTER_URL)
+    loop = asyncio.new_event_loop()
+
+    async def collect(response):
+        return [item async for item in spider.parse(response)]
+
+    return lambda response: loop.run_until_complete(collect(response))
+
+
+def make_rankings_case():
+    # Settings and stats of a real crawl, without starting one.
+    crawler = Crawler(RankingSpider, get_project_settings())
+    crawler.stats = MemoryStatsCollector(crawler)
+    spider = RankingSpider.from_crawler(crawler)
+    # Names as they are stored in the database, so most lookups resolve like a real run.
+    spider.fighter_cache = {name: str(index) for index, name in enumerate(_ranked_names())}
+    spider.name_index = spider.build_name_index(spider.fighter_cache)
+
+    def run(response):
+        spider.rankings_buffer = []
+        spider.collect_rankings(response)
+        return spider.rankings_buffer
+
+    return run
+
+
+def _ranked_names():
+    with open(os.path.join(FIXTURES_DIR, "ufc_rankings.html"), "rb") as f:
+        response = HtmlResponse(url=RANKINGS_URL, body=f.read(), encoding="utf-8")
+    return [name.strip() for name in response.css(".views-field-title a::text, .info h5 a::text").getall()]
+
+
+def make_listing_case():
+    spider = SmartSpider(mode="upcoming")
+    return spider.extract_listing_events
+
+
+CASES = {
+    "event_card_small": ("tapology_event_small.html", EVENT_URL, lambda: run_parse_card),
+    "event_card_ppv": ("tapology_event_ppv.html", EVENT_URL, lambda: run_parse_card),
+    "cancelled_fights": ("tapology_event_ppv.html", EVENT_URL, lambda: run_cancelled_fights),
+    "fighter_profile": ("tapology_fighter_profile.html", FIGHTER_URL, make_fighter_case),
+    "rankings": ("ufc_rankings.html", RANKINGS_URL, make_rankings_case),
+    "promotion_listing": ("tapology_promotion_listing.html", LISTING_URL, make_listing_case),
+}
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(name, iterations):
+    fixture, url, factory = CASES[name]
+    with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+        body = f.read()
+    callback = factory()
+
+    # A fresh response per call so the lazy HTML parse is part of the measured cost.
+    def call():
+        return callback(HtmlResponse(url=url, body=body, encoding="utf-8"))
+
+    call()  # warm-up
+
+    latencies = []
+    item_count = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        item_count += len(call())
+        latencies.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "items_per_call": item_count // iterations,
+        "items_per_sec": item_count / sum(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def calibrate(results, fixture_set):
+    cases = {}
+    for name, result in results.items():
+        cases[name] = {
+            "min_items_per_call": result["items_per_call"],
+            "min_items_per_sec": int(result["items_per_sec"] / CALIBRATION_HEADROOM["items_per_sec"] // 100 * 100),
+            "max_p95_ms": math.ceil(result["p95_ms"] * CALIBRATION_HEADROOM["p95_ms"]),
+            "max_peak_kib": math.ceil(result["peak_kib"] * CALIBRATION_HEADROOM["peak_kib"] / 64) * 64,
+        }
+    return {"fixture_set": fixture_set, "cases": cases}
+
+
+def write_thresholds(path, thresholds):
+    # One line per case keeps diffs of re-calibrations readable.
+    lines = [f'  "fixture_set": {json.dumps(thresholds["fixture_set"])},', '  "cases": {']
+    cases = list(thresholds["cases"].items())
+    for index, (name, limits) in enumerate(cases):
+        lines.append(f'    {json.dumps(name)}: {json.dumps(limits)}{"," if index < len(cases) - 1 else ""}')
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{\n" + "\n".join(lines) + "\n  }\n}\n")
+
+
+def check_thresholds(name, result, thresholds):
+    limits = thresholds.get(name, {})
+    failures = []
+
+    for metric in ("p50_ms", "p95_ms", "p99_ms", "peak_kib"):
+        limit = limits.get(f"max_{metric}")
+        if limit is not None and result[metric] > limit:
+            failures.append(f"{metric} {result[metric]:.2f} > {limit}")
+
+    limit = limits.get("min_items_per_sec")
+    if limit is not None and result["items_per_sec"] < limit:
+        failures.append(f"items_per_sec {result['items_per_sec']:.0f} < {limit}")
+
+    limit = limits.get("min_items_per_call")
+    if limit is not None and result["items_per_call"] < limit:
+        failures.append(f"items_per_call {result['items_per_call']} < {limit}")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="JSON file with per-case limits")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    parser.add_argument("--calibrate", action="store_true", help="rewrite the thresholds file from this run (all cases)")
+    args = parser.parse_args()
+
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        fixture_set = json.load(f)["fixture_set"]
+
+    if args.calibrate:
+        args.only = None
+    else:
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+        if thresholds.get("fixture_set") != fixture_set:
+            print(f"Warning: thresholds were calibrated on fixture set '{thresholds.get('fixture_set')}', "
+                  f"the fixtures are '{fixture_set}'. Re-run with --calibrate.\n")
+
+    results = {}
+    regressions = {}
+
+    print(f"{'case':<20} {'items':>6} {'items/s':>10} {'p50':>9} {'p95':>9} {'p99':>9} {'peak':>10}")
+    for name in args.only or CASES:
+        result = run_case(name, args.iterations)
+        results[name] = result
+
+        failures = [] if args.calibrate else check_thresholds(name, result, thresholds["cases"])
+        if failures:
+            regressions[name] = failures
+
+        print(f"{name:<20} {result['items_per_call']:>6} {result['items_per_sec']:>10.0f} "
+              f"{result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms "
+              f"{result['peak_kib']:>7.0f}KiB{'  REGRESSION' if failures else ''}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "regressions": regressions}, f, indent=2)
+
+    if args.calibrate:
+        write_thresholds(args.thresholds, calibrate(results, fixture_set))
+        print(f"\nWrote thresholds for fixture set '{fixture_set}' to {args.thresholds}.")
+        return
+
+    if regressions:
+        print("\nThreshold violations:")
+        for name, failures in regressions.items():
+            for failure in failures:
+                print(f"  {name}: {failure}")
+        sys.exit(1)
+
+    print("\nAll cases within thresholds.")
+
+
+if __name__ == "__main__":
+    main()
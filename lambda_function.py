@@ -1,13 +1,81 @@
-import subprocess
+import os
+import time
 import logging
 import json
+from datetime import datetime, timedelta, timezone
 import boto3
+from scrapy.utils.project import get_project_settings
+from ufc_scraper.services.crawl_runner import CrawlRunner
+
+# /var/task is read-only; /tmp survives between warm invocations.
+os.environ.setdefault("LOCAL_STORE_PATH", "/tmp/ufc_scraper/state.sqlite3")
+os.environ.setdefault("PROFILE_OUTPUT_DIR", "/tmp/ufc_scraper/profiles")
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 lambda_client = boto3.client('lambda')
 
+# Created at import time so warm invocations reuse the reactor, settings and Supabase client.
+crawl_settings = get_project_settings()
+crawl_settings.set("LOG_LEVEL", "INFO", priority="cmdline")
+crawl_runner = CrawlRunner(crawl_settings)
+
+SUMMARY_STATS = (
+    "finish_reason",
+    "elapsed_time_seconds",
+    "item_scraped_count",
+    "response_received_count",
+    "log_count/ERROR",
+    "backfill/pages_done",
+    "backfill/events_done",
+    "backfill/events_per_min",
+    "rescue/fighters_requested",
+    "rescue/fighters_failed",
+    "deadline/deferred",
+)
+
+# Seconds kept free at the end of a backfill invocation for the final flush and checkpoint.
+BACKFILL_SHUTDOWN_MARGIN = 90
+
+# Fighter INSERT webhooks: how long to wait for the rest of a card's inserts, and how far back a
+# pending fighter (no record yet) counts as part of the current batch.
+RESCUE_DEBOUNCE_SECONDS = 15
+RESCUE_PENDING_WINDOW = 10 * 60
+
+# Asynchronous invokes accept payloads up to 256 KB. Above this the sync gets per-table counts
+# only and has to rediscover the changed rows itself.
+SYNC_PAYLOAD_LIMIT = 200 * 1024
+
+
+def summarize_stats(stats):
+    return {key: stats[key] for key in SUMMARY_STATS if key in stats}
+
+
+def trigger_sync(source, changes):
+    """Invoke SupabaseToDynamoSync with the crawl's change manifest. Returns False when nothing changed."""
+    if not any(changes.values()):
+        logger.info(f"[SYNC] No rows changed for '{source}'. Sync skipped.")
+        return False
+
+    payload = json.dumps({'source': source, 'changes': changes}).encode('utf-8')
+    if len(payload) > SYNC_PAYLOAD_LIMIT:
+        logger.warning(f"[SYNC] Change manifest is {len(payload)} bytes. Sending per-table counts only.")
+        payload = json.dumps({
+            'source': source,
+            'changes': None,
+            'change_counts': {table: len(keys) for table, keys in changes.items()},
+            'truncated': True,
+        }).encode('utf-8')
+
+    lambda_client.invoke(
+        FunctionName='SupabaseToDynamoSync',
+        InvocationType='Event',
+        Payload=payload
+    )
+    return True
+
+
 def handler(event, context):
 
     if 'task' in event:
@@ -15,27 +83,52 @@ def handler(event, context):
         logger.info(f"[SCHEDULED] Task triggered: {task_type}")
 
         try:
+            # Low-priority event pages are left for the next run when the invocation is about to time out.
+            deadline = time.time() + context.get_remaining_time_in_millis() / 1000
+
             if task_type == 'live':
-                subprocess.run(["scrapy", "crawl", "smart", "-a", "mode=live", "--loglevel", "INFO"], check=True)
+                stats = crawl_runner.run("smart", mode="live", deadline=deadline)
+            elif task_type == 'live_session':
+                stats = crawl_runner.run("smart", mode="live", session="true", deadline=deadline)
             elif task_type == 'upcoming':
-                subprocess.run(["scrapy", "crawl", "smart", "-a", "mode=upcoming", "--loglevel", "INFO"], check=True)
+                stats = crawl_runner.run("smart", mode="upcoming", deadline=deadline)
+            elif task_type == 'backfill':
+                # Close the crawl cleanly before Lambda's timeout; the next invocation resumes from the checkpoint.
+                budget = max(60, context.get_remaining_time_in_millis() / 1000 - BACKFILL_SHUTDOWN_MARGIN)
+                overrides = {"CLOSESPIDER_TIMEOUT": budget}
+                # {"writer": "copy"} writes the backfill over a direct Postgres connection instead of PostgREST.
+                if event.get('writer'):
+                    overrides["SUPABASE_WRITER"] = event['writer']
+                stats = crawl_runner.run(
+                    "smart",
+                    settings_overrides=overrides,
+                    mode="backfill",
+                    shard=event.get('shard', 0),
+                    shards=event.get('shards', 1),
+                )
             else:
                 return {"statusCode": 400, "body": "Undefined task"}
 
-            logger.info(f"Scraper finished for '{task_type}'. Triggering Sync Lambda...")
+            logger.info(f"Crawl stats for '{task_type}': {summarize_stats(stats)}")
+
+            changes = crawl_runner.last_changes
+            change_counts = {table: len(keys) for table, keys in changes.items()}
+            logger.info(f"Scraper finished for '{task_type}'. Changed rows: {change_counts}")
+            triggered = False
             try:
-                lambda_client.invoke(
-                    FunctionName='SupabaseToDynamoSync',
-                    InvocationType='Event',
-                    Payload=json.dumps({'source': f'scraper_{task_type}'}).encode('utf-8')
-                )
-                logger.info("Sync Lambda successfully triggered (Scheduled).")
+                triggered = trigger_sync(f'scraper_{task_type}', changes)
+                if triggered:
+                    logger.info("Sync Lambda successfully triggered (Scheduled).")
             except Exception as e:
                 logger.error(f"Error triggering Sync Lambda: {str(e)}")
 
-            return {"statusCode": 200, "body": f"Scheduled task '{task_type}' completed and Sync triggered"}
+            return {
+                "statusCode": 200,
+                "body": f"Scheduled task '{task_type}' completed and Sync {'triggered' if triggered else 'skipped'}",
+                "stats": summarize_stats(stats),
+            }
 
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             logger.error(f"Scheduled spider failed: {str(e)}")
             raise e
 
@@ -56,27 +149,39 @@ def handler(event, context):
                      logger.warning(f"[WEBHOOK] Fighter {fighter_id} has no profile URL. Skipping.")
                      return {"statusCode": 200, "body": "No URL, skipped"}
 
-                logger.info(f"[WEBHOOK] Rescuing fighter: {fighter_id} from {profile_url}")
+                # A card insert fires one webhook per new fighter. Wait for the burst to settle, then crawl
+                # every pending fighter no other invocation has claimed (this one's always included).
+                logger.info(f"[WEBHOOK] Fighter {fighter_id} inserted. Waiting {RESCUE_DEBOUNCE_SECONDS}s for the batch to settle.")
+                time.sleep(RESCUE_DEBOUNCE_SECONDS)
+
+                updated_since = (datetime.now(timezone.utc) - timedelta(seconds=RESCUE_PENDING_WINDOW)).isoformat()
+                stats = crawl_runner.run(
+                    "fighter", from_db="true", fighter_id=fighter_id, profile_url=profile_url, updated_since=updated_since
+                )
+
+                if stats.get("rescue/deferred"):
+                    logger.info(f"[WEBHOOK] Fighter {fighter_id} and the other pending fighters are claimed by another invocation.")
+                    return {"statusCode": 200, "body": f"Rescue of {fighter_id} coalesced", "stats": summarize_stats(stats)}
 
-                subprocess.run([
-                    "scrapy", "crawl", "fighter",
-                    "-a", f"profile_url={profile_url}",
-                    "-a", f"fighter_id={fighter_id}",
-                    "--loglevel", "INFO"
-                ], check=True)
+                rescued = stats.get("rescue/fighters_requested", 0)
+                if not rescued:
+                    logger.info(f"[WEBHOOK] No fighters pending rescue for {fighter_id}. Nothing to sync.")
+                    return {"statusCode": 200, "body": "Nothing pending", "stats": summarize_stats(stats)}
 
-                logger.info(f"Rescue scrape finished for fighter {fighter_id}. Triggering Sync Lambda...")
+                logger.info(f"Rescue batch triggered by fighter {fighter_id} finished ({rescued} fighters). Triggering Sync Lambda...")
+                triggered = False
                 try:
-                    lambda_client.invoke(
-                        FunctionName='SupabaseToDynamoSync',
-                        InvocationType='Event',
-                        Payload=json.dumps({'source': f'webhook_rescue_{fighter_id}'}).encode('utf-8')
-                    )
-                    logger.info("Sync Lambda successfully triggered (Webhook).")
+                    triggered = trigger_sync(f'webhook_rescue_{fighter_id}', crawl_runner.last_changes)
+                    if triggered:
+                        logger.info("Sync Lambda successfully triggered (Webhook).")
                 except Exception as e:
                     logger.error(f"Error triggering Sync Lambda from Webhook: {str(e)}")
 
-                return {"statusCode": 200, "body": f"Rescue scrape finished for {fighter_id} and Sync triggered"}
+                return {
+                    "statusCode": 200,
+                    "body": f"Rescue batch of {rescued} fighters finished and Sync {'triggered' if triggered else 'skipped'}",
+                    "stats": summarize_stats(stats),
+                }
 
             else:
                 logger.info(f"[WEBHOOK] Ignored event: Table={table}, Type={op_type}")
@@ -85,9 +190,6 @@ def handler(event, context):
         except json.JSONDecodeError:
             logger.error("Failed to decode Webhook JSON body")
             return {"statusCode": 400, "body": "Invalid JSON"}
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Rescue spider failed: {str(e)}")
-            raise e
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
             raise e
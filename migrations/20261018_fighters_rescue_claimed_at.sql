@@ -0,0 +1,13 @@
+-- Claim/lease column for fighter rescue runs (FighterSpider -a from_db=true).
+--
+-- A webhook-triggered rescue sets rescue_claimed_at on the pending fighters it is about to crawl;
+-- a claim older than RESCUE_CLAIM_LEASE is taken over by the next rescue. Required on the
+-- production database before deploying the rescue code. The backup database does not need it:
+-- scripts/sync_daily.py drops the column when copying fighters. Idempotent, so running it there
+-- too is harmless.
+
+alter table public.fighters
+    add column if not exists rescue_claimed_at timestamptz;
+
+comment on column public.fighters.rescue_claimed_at is
+    'When a rescue run claimed this fighter for a profile crawl; NULL when never claimed.';
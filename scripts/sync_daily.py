@@ -1,4 +1,6 @@
 import os
+import json
+import time
 import asyncio
 from datetime import datetime, timedelta, timezone
 from supabase import acreate_client, AsyncClient
@@ -11,44 +13,137 @@ PROD_KEY = os.getenv("SUPABASE_PROD_KEY")
 BACKUP_URL = os.getenv("SUPABASE_DEV_URL")
 BACKUP_KEY = os.getenv("SUPABASE_DEV_KEY")
 
-SYNC_TABLES = [
-    "events",
-    "fighters",
-    "fights",
-    "rankings",
-    "participants"
+# Per-table updated_at watermarks; the workflow restores and saves this file with actions/cache.
+STATE_PATH = os.getenv("SYNC_STATE_PATH", "state/sync_watermarks.json")
+PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "1000"))
+MAX_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "4"))
+# Re-read this far behind the watermark: rows committed late can carry an older updated_at.
+OVERLAP = timedelta(minutes=int(os.getenv("SYNC_OVERLAP_MINUTES", "10")))
+# Without a watermark, start from this far back (the old fixed window).
+INITIAL_WINDOW = timedelta(hours=25)
+
+# Tables in the same stage have no FK between them and are synced concurrently.
+SYNC_STAGES = [
+    ["events", "fighters"],
+    ["fights", "rankings"],
+    ["participants"],
 ]
 
-async def sync_table(prod_client: AsyncClient, backup_client: AsyncClient, table_name: str):
+PRIMARY_KEYS = {
+    "events": ["event_id"],
+    "fighters": ["fighter_id"],
+    "fights": ["fight_id"],
+    "rankings": ["weight_class_id", "rank_number"],
+    "participants": ["fight_id", "fighter_id"],
+}
+
+# Columns left out of the backup: generated ones it rejects on insert, and production-only
+# bookkeeping (the rescue claim, see migrations/) that the backup schema does not have
+DROP_COLUMNS = {
+    "events": ["event_year"],
+    "fighters": ["rescue_claimed_at"],
+}
+
+
+def load_state():
+    if not os.path.exists(STATE_PATH):
+        return {}
+    with open(STATE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH) or ".", exist_ok=True)
+    with open(STATE_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(STATE_PATH + ".tmp", STATE_PATH)
+
+
+def quote(value):
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def keyset_filter(columns, row):
+    # (c1, c2, ...) > (v1, v2, ...) as a PostgREST logic tree:
+    # c1.gt.v1, and(c1.eq.v1, or(c2.gt.v2, and(c2.eq.v2, ...)))
+    column, rest = columns[0], columns[1:]
+    greater = f"{column}.gt.{quote(row[column])}"
+    if not rest:
+        return greater
+    return f"{greater},and({column}.eq.{quote(row[column])},or({keyset_filter(rest, row)}))"
+
+
+async def fetch_page(prod_client: AsyncClient, table_name: str, since: str, after: dict | None):
+    order_columns = ["updated_at"] + PRIMARY_KEYS[table_name]
+
+    query = prod_client.table(table_name).select("*").gte("updated_at", since)
+    if after:
+        query = query.or_(keyset_filter(order_columns, after))
+    for column in order_columns:
+        query = query.order(column)
+
+    response = await query.limit(PAGE_SIZE).execute()
+    return response.data
+
+
+async def sync_table(prod_client: AsyncClient, backup_client: AsyncClient, table_name: str, state: dict):
     print(f"--- Syncing table: {table_name} ---")
 
-    yesterday = datetime.now(timezone.utc) - timedelta(hours=25)
+    watermark = state.get(table_name)
+    if watermark:
+        since = (datetime.fromisoformat(watermark) - OVERLAP).isoformat()
+    else:
+        since = (datetime.now(timezone.utc) - INITIAL_WINDOW).isoformat()
 
-    try:
-        response = await prod_client.table(table_name)\
-            .select("*")\
-            .gt("updated_at", yesterday.isoformat())\
-            .execute()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    writes = []
+    synced = 0
+    last_row = None
+    started = time.perf_counter()
 
-        data = response.data
+    async def write_chunk(rows):
+        try:
+            await backup_client.table(table_name).upsert(rows, on_conflict=",".join(PRIMARY_KEYS[table_name])).execute()
+        finally:
+            semaphore.release()
 
-        if not data:
-            print(f"No changes found for {table_name}.")
-            return
+    try:
+        # Pages are read in keyset order; each one is written while the next is fetched,
+        # with at most MAX_CONCURRENCY writes in flight.
+        while True:
+            page = await fetch_page(prod_client, table_name, since, last_row)
+            if not page:
+                break
+
+            last_row = page[-1]
+            rows = [{key: value for key, value in row.items() if key not in DROP_COLUMNS.get(table_name, [])} for row in page]
 
-        if table_name == "events":
-            for record in data:
-                record.pop("event_year", None)
+            await semaphore.acquire()
+            writes.append(asyncio.create_task(write_chunk(rows)))
+            synced += len(rows)
 
-        print(f"Found {len(data)} records to upsert in {table_name}...")
+            if len(page) < PAGE_SIZE:
+                break
 
-        await backup_client.table(table_name).upsert(data).execute()
-        print(f"Successfully synced {len(data)} records to {table_name}.")
+        await asyncio.gather(*writes)
 
     except Exception as e:
+        for write in writes:
+            write.cancel()
         print(f"ERROR syncing {table_name}: {e}")
         raise e
 
+    elapsed = time.perf_counter() - started
+    if not synced:
+        print(f"No changes found for {table_name} since {since}.")
+        return
+
+    # Only advanced once every chunk is in the backup, so a failed run is retried from the old watermark.
+    state[table_name] = last_row["updated_at"]
+    print(f"Successfully synced {synced} records to {table_name} in {elapsed:.1f}s "
+          f"({synced / elapsed:.0f} rows/s). Watermark: {state[table_name]}")
+
+
 async def main():
     if not all([PROD_URL, PROD_KEY, BACKUP_URL, BACKUP_KEY]):
         print("Error: Missing environment variables.")
@@ -57,11 +152,21 @@ async def main():
     prod_client = await acreate_client(PROD_URL, PROD_KEY)
     backup_client = await acreate_client(BACKUP_URL, BACKUP_KEY)
 
+    state = load_state()
     print(f"Starting Daily Sync at {datetime.now(timezone.utc)}")
 
     try:
-        for table in SYNC_TABLES:
-            await sync_table(prod_client, backup_client, table)
+        for stage in SYNC_STAGES:
+            results = await asyncio.gather(
+                *(sync_table(prod_client, backup_client, table, state) for table in stage),
+                return_exceptions=True,
+            )
+            # Watermarks of the tables that did finish are kept even if a sibling failed.
+            save_state(state)
+
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
 
         print("\nDaily Sync Completed Successfully!")
 
@@ -0,0 +1,132 @@
+# Define here your Scrapy extensions
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/extensions.html
+
+import os
+import json
+import logging
+from datetime import datetime
+from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+from .services.metrics import MetricsRegistry
+from .services.profiler import RunProfiler
+
+
+class MetricsExtension:
+    # Collects crawl performance metrics and prints them as CloudWatch Embedded Metric Format
+    # (EMF) JSON lines when the spider closes. On Lambda, CloudWatch Logs turns those lines into
+    # metrics, dimensioned by spider and mode (plus table, item type, callback, ...).
+    #
+    # Bytes, download latency and items come from signals; callback time from
+    # CallbackTimingMiddleware; rows and upsert latency from DatabasePipeline; query latency
+    # from SupabaseManager. All of them record into the shared MetricsRegistry.
+
+    def __init__(self, stats, namespace):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats = stats
+        self.namespace = namespace
+        self.metrics = MetricsRegistry.shared()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # The pipeline and SupabaseManager record unconditionally; the registry drops it when disabled.
+        enabled = crawler.settings.getbool("METRICS_ENABLED")
+        MetricsRegistry.shared().set_enabled(enabled)
+        if not enabled:
+            raise NotConfigured
+
+        ext = cls(crawler.stats, crawler.settings.get("METRICS_NAMESPACE"))
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.bytes_received, signal=signals.bytes_received)
+        crawler.signals.connect(ext.response_downloaded, signal=signals.response_downloaded)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        return ext
+
+    def spider_opened(self, spider):
+        # The registry outlives the crawl when a CrawlRunner is reused across invocations.
+        self.metrics.reset()
+
+    def bytes_received(self, data, request, spider):
+        self.metrics.increment("BytesDownloaded", len(data), unit="Bytes")
+
+    def response_downloaded(self, response, request, spider):
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            self.metrics.observe("DownloadLatency", latency * 1000)
+        self.metrics.increment("ResponsesDownloaded", dimensions={"Status": response.status})
+
+    def item_scraped(self, item, response, spider):
+        self.metrics.increment("ItemsScraped", dimensions={"ItemType": ItemAdapter(item).get("item_type") or "unknown"})
+
+    def spider_closed(self, spider, reason):
+        elapsed = self.stats.get_value("elapsed_time_seconds")
+        if elapsed is not None:
+            self.metrics.observe("CrawlDuration", elapsed, unit="Seconds")
+
+        dimensions = {"Spider": spider.name, "Mode": getattr(spider, "mode", None) or "default"}
+        documents = self.metrics.to_emf(self.namespace, dimensions)
+
+        # EMF has to be a log line of its own, without logging prefixes.
+        for document in documents:
+            print(json.dumps(document, separators=(",", ":")), flush=True)
+
+        self.logger.info(f"[METRICS] Emitted {len(documents)} EMF documents to namespace '{self.namespace}'.")
+
+
+class ProfilingExtension:
+    # Opt-in cProfile + tracemalloc for selected functions (PROFILE_TARGETS), turned on with
+    # PROFILE_ENABLED or per run with -a profile=true (and optionally -a profile_targets=a,b).
+    #
+    # Writes <PROFILE_OUTPUT_DIR>/profile_<spider>_<timestamp>.prof (open with pstats or snakeviz)
+    # and a .txt report with per-target time, the top N hot functions and the top N allocation sites.
+    # When off, nothing is wrapped.
+
+    def __init__(self, enabled, targets, top_n, output_dir):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.enabled = enabled
+        self.targets = targets
+        self.top_n = top_n
+        self.output_dir = output_dir
+        self.profiler = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(
+            crawler.settings.getbool("PROFILE_ENABLED"),
+            crawler.settings.getlist("PROFILE_TARGETS"),
+            crawler.settings.getint("PROFILE_TOP_N"),
+            crawler.settings.get("PROFILE_OUTPUT_DIR"),
+        )
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        requested = str(getattr(spider, "profile", "")).lower() in ("1", "true", "yes")
+        if not (self.enabled or requested):
+            return
+
+        targets = getattr(spider, "profile_targets", None)
+        targets = targets.split(",") if isinstance(targets, str) else self.targets
+
+        self.profiler = RunProfiler(targets, self.top_n)
+        self.profiler.install()
+        self.logger.info(f"[PROFILING] Profiling {len(targets)} targets: {', '.join(targets)}")
+
+    def spider_closed(self, spider, reason):
+        if not self.profiler:
+            return
+
+        self.profiler.uninstall()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(self.output_dir, f"profile_{spider.name}_{timestamp}")
+
+        self.profiler.write_reports(f"{base_path}.prof", f"{base_path}.txt")
+        self.profiler = None
+        self.logger.info(f"[PROFILING] Wrote {base_path}.prof and {base_path}.txt")
@@ -3,32 +3,9 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
-import scrapy
-
-
-class EventItem(scrapy.Item):
-    item_type = scrapy.Field()
-    event_id = scrapy.Field()  # PK
-    event_url = scrapy.Field()
-    status = scrapy.Field()
-    name = scrapy.Field()
-    datetime_utc = scrapy.Field()
-    venue = scrapy.Field()
-    location = scrapy.Field()
+from dataclasses import dataclass
 
-
-class FightItem(scrapy.Item):
-    item_type = scrapy.Field()
-    fight_id = scrapy.Field()  # PK
-    event_id = scrapy.Field()  # FK -> EventItem
-    method_type = scrapy.Field()
-    method_detail = scrapy.Field()
-    round_summary = scrapy.Field()
-    bout_type = scrapy.Field()
-    weight_class_lbs = scrapy.Field()
-    weight_class_id = scrapy.Field()
-    rounds_format = scrapy.Field()
-    fight_order = scrapy.Field()
+import scrapy
 
 
 class FighterItem(scrapy.Item):
@@ -49,12 +26,63 @@ class FighterItem(scrapy.Item):
     image_url = scrapy.Field()
 
 
-class FightParticipationItem(scrapy.Item):
-    item_type = scrapy.Field()
-    fight_id = scrapy.Field()  # FK -> FightItem
-    fighter_id = scrapy.Field()  # FK -> FighterItem
-    odds_value = scrapy.Field()
-    odds_label = scrapy.Field()
-    result = scrapy.Field()
-    record_after_fight = scrapy.Field()
-    is_red_corner = scrapy.Field()
+# Slotted rows for the card parsers' hot path. A backfill yields five items per bout, and
+# dict-backed Items cost a dict per item plus a copy in the pipeline. These carry one
+# slot per column and hand the pipeline its row directly through to_row(). ItemAdapter
+# supports them like any dataclass, so exporters and extensions need no changes.
+
+class RowMixin:
+    __slots__ = ()
+
+    def to_row(self) -> dict:
+        """Column -> value for the database row (everything but item_type)."""
+        return {name: getattr(self, name) for name in self.__slots__ if name != "item_type"}
+
+
+@dataclass(slots=True)
+class EventRow(RowMixin):
+    event_id: str  # PK
+    event_url: str | None = None
+    name: str | None = None
+    status: str | None = None
+    datetime_utc: str | None = None
+    venue: str | None = None
+    location: str | None = None
+    item_type: str = "event"
+
+
+@dataclass(slots=True)
+class FightRow(RowMixin):
+    fight_id: str  # PK
+    event_id: str | None = None  # FK -> EventRow
+    method_type: str | None = None
+    method_detail: str | None = None
+    round_summary: str | None = None
+    bout_type: str | None = None
+    weight_class_lbs: str | None = None
+    weight_class_id: str | None = None
+    rounds_format: str | None = None
+    fight_order: str | None = None
+    item_type: str = "fight"
+
+
+@dataclass(slots=True)
+class FighterRow(RowMixin):
+    # Only what a fight card shows; the profile columns come from FighterSpider's FighterItem.
+    fighter_id: str  # PK
+    name: str | None = None
+    profile_url: str | None = None
+    image_url: str | None = None
+    item_type: str = "fighter"
+
+
+@dataclass(slots=True)
+class ParticipationRow(RowMixin):
+    fight_id: str  # FK -> FightRow
+    fighter_id: str  # FK -> FighterRow
+    odds_value: int | None = None
+    odds_label: str | None = None
+    result: str | None = None
+    record_after_fight: dict | None = None
+    is_red_corner: bool | None = None
+    item_type: str = "participation"
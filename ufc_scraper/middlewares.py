@@ -3,11 +3,19 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
+from collections import deque
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.downloadermiddlewares.retry import get_retry_request
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from .parsers.event_page_parser import EventPageParser
+from .services.local_store import LocalStore
+from .services.metrics import MetricsRegistry
+
 
 class UfcScraperSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -53,6 +61,60 @@ class UfcScraperSpiderMiddleware:
         spider.logger.info("Spider opened: %s" % spider.name)
 
 
+class CallbackTimingMiddleware:
+    # Records the time spent inside each spider callback as the CallbackTime metric, per callback.
+    #
+    # Only the time taken to produce each result is counted, not the time later middlewares and
+    # the engine spend on it. For async callbacks the time spent awaiting (database queries,
+    # live-session sleeps) is included.
+
+    def __init__(self):
+        self.metrics = MetricsRegistry.shared()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("METRICS_ENABLED"):
+            raise NotConfigured
+        return cls()
+
+    def process_spider_output(self, response, result, spider):
+        iterator = iter(result)
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item_or_request = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                yield item_or_request
+        finally:
+            self._record(response, elapsed)
+
+    async def process_spider_output_async(self, response, result, spider):
+        iterator = result.__aiter__()
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item_or_request = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                yield item_or_request
+        finally:
+            self._record(response, elapsed)
+
+    def _record(self, response, elapsed):
+        callback = response.request.callback if response.request else None
+        name = getattr(callback, "__name__", None) or "parse"
+        self.metrics.observe("CallbackTime", elapsed * 1000, dimensions={"Callback": name})
+
+
 class UfcScraperDownloaderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
     # scrapy acts as if the downloader middleware does not modify the
@@ -98,3 +160,268 @@ class UfcScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class ConditionalEventPageMiddleware:
+    # Answers unchanged event pages without re-parsing them.
+    #
+    # Requests opt in with meta["validator_key"] (the event_id). Stored ETag/Last-Modified values
+    # are sent as conditional headers; a 304, or a 200 whose card fingerprint matches the stored
+    # one, is dropped before it reaches the parser. New validators are only persisted when the
+    # crawl finishes without errors, so a failed write is retried on the next run.
+
+    STORE_NAMESPACE = "event_page_validators"
+
+    def __init__(self, store, stats, max_age):
+        self.store = store
+        self.stats = stats
+        self.max_age = max_age
+        self.pending = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("CONDITIONAL_FETCH_ENABLED"):
+            raise NotConfigured
+
+        s = cls(
+            LocalStore.from_settings(crawler.settings),
+            crawler.stats,
+            crawler.settings.getint("CONDITIONAL_FETCH_MAX_AGE"),
+        )
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def process_request(self, request, spider):
+        key = request.meta.get("validator_key")
+        if not key:
+            return None
+
+        validators = self._fresh_validators(key)
+        if validators.get("etag"):
+            request.headers.setdefault("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.headers.setdefault("If-Modified-Since", validators["last_modified"])
+        return None
+
+    def process_response(self, request, response, spider):
+        key = request.meta.get("validator_key")
+        if not key:
+            return response
+
+        if response.status == 304:
+            self.stats.inc_value("conditional_fetch/hit_304", spider=spider)
+            raise IgnoreRequest(f"Event page {key} not modified (304)")
+
+        if response.status != 200:
+            return response
+
+        validators = self._fresh_validators(key)
+        body_hash = EventPageParser.card_fingerprint(response)
+
+        self.pending[key] = {
+            "etag": response.headers.get("ETag", b"").decode("latin-1") or None,
+            "last_modified": response.headers.get("Last-Modified", b"").decode("latin-1") or None,
+            "body_hash": body_hash,
+            "stored_at": validators.get("stored_at") if validators.get("body_hash") == body_hash else time.time(),
+        }
+
+        if validators.get("body_hash") == body_hash:
+            self.stats.inc_value("conditional_fetch/hit_unchanged", spider=spider)
+            raise IgnoreRequest(f"Event page {key} unchanged since last parse")
+
+        self.stats.inc_value("conditional_fetch/miss", spider=spider)
+        return response
+
+    def spider_closed(self, spider, reason):
+        if reason != "finished" or self.stats.get_value("log_count/ERROR", 0, spider=spider):
+            spider.logger.info(f"[CONDITIONAL FETCH] Crawl ended with '{reason}' or errors; keeping previous validators.")
+            return
+
+        self.store.set_many(self.STORE_NAMESPACE, self.pending)
+        spider.logger.info(f"[CONDITIONAL FETCH] Stored validators for {len(self.pending)} event pages.")
+
+    def _fresh_validators(self, key):
+        validators = self.store.get(self.STORE_NAMESPACE, key) or {}
+        # Expired entries are ignored so every page gets a full parse at least once per max_age.
+        if time.time() - validators.get("stored_at", 0) > self.max_age:
+            return {}
+        return validators
+
+
+class AdaptiveThrottleMiddleware:
+    # AIMD controller for per-domain concurrency and delay.
+    #
+    # Every response updates the slot's latency average and recent error rate. A 429/503, a 5xx, a
+    # block page, a download error or a latency above the profile's target halves concurrency and
+    # doubles the delay (at most once per cooldown); a run of fast successes adds one to concurrency
+    # and shortens the delay, unless the recent error rate is above the profile's limit. Limits and
+    # targets come from THROTTLE_PROFILES, chosen by the spider's throttle_profile or mode attribute.
+    # Block pages are retried instead of reaching the parser.
+
+    THROTTLED_STATUSES = (429, 503)
+    BLOCK_PAGE_TITLES = (b"<title>just a moment", b"<title>attention required", b"<title>access denied")
+
+    def __init__(self, crawler, profiles):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.profiles = profiles
+        self.profile = profiles["default"]
+        self.slots = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("THROTTLE_ENABLED"):
+            raise NotConfigured
+
+        s = cls(crawler, crawler.settings.getdict("THROTTLE_PROFILES"))
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        return s
+
+    def spider_opened(self, spider):
+        name = getattr(spider, "throttle_profile", None) or getattr(spider, "mode", None)
+        if name not in self.profiles:
+            name = "default"
+        self.profile = self.profiles[name]
+        spider.logger.info(f"[THROTTLE] Using the '{name}' profile: {self.profile}")
+
+    def process_request(self, request, spider):
+        downloader = self.crawler.engine.downloader
+        key = downloader.get_slot_key(request)
+
+        # New slots start from the profile instead of DOWNLOAD_DELAY / CONCURRENT_REQUESTS_PER_DOMAIN.
+        if key not in self.slots:
+            self.slots[key] = {"latency": None, "outcomes": deque(maxlen=20), "successes": 0, "last_decrease": 0.0}
+            downloader.per_slot_settings.setdefault(key, {
+                "concurrency": self.profile["start_concurrency"],
+                "delay": self.profile["start_delay"],
+            })
+        return None
+
+    def process_response(self, request, response, spider):
+        key = request.meta.get("download_slot")
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None or key not in self.slots:
+            return response
+
+        state = self.slots[key]
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            state["latency"] = latency if state["latency"] is None else 0.8 * state["latency"] + 0.2 * latency
+
+        throttled = response.status in self.THROTTLED_STATUSES
+        blocked = not throttled and self._is_block_page(response)
+        failed = throttled or blocked or response.status >= 500
+        state["outcomes"].append(failed)
+
+        if throttled:
+            self.stats.inc_value("throttle/throttled_responses", spider=spider)
+        if blocked:
+            self.stats.inc_value("throttle/block_pages", spider=spider)
+
+        if failed:
+            self._decrease(key, slot, state, spider, self._retry_after(response))
+        elif latency is not None and latency > self.profile["target_latency"]:
+            self._decrease(key, slot, state, spider)
+        else:
+            self._increase(key, slot, state, spider)
+
+        self.stats.set_value(f"throttle/{key}/concurrency", slot.concurrency, spider=spider)
+        self.stats.set_value(f"throttle/{key}/delay", round(slot.delay, 3), spider=spider)
+        if state["latency"] is not None:
+            self.stats.set_value(f"throttle/{key}/latency_ms", round(state["latency"] * 1000), spider=spider)
+
+        if blocked:
+            retry_request = get_retry_request(request, spider=spider, reason="throttle_block_page")
+            if retry_request is None:
+                raise IgnoreRequest(f"Block page for {request.url}, retries exhausted")
+            return retry_request
+
+        return response
+
+    def process_exception(self, request, exception, spider):
+        key = request.meta.get("download_slot")
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is not None and key in self.slots:
+            self.slots[key]["outcomes"].append(True)
+            self._decrease(key, slot, self.slots[key], spider)
+        return None
+
+    def _decrease(self, key, slot, state, spider, retry_after=0.0):
+        # One decrease per cooldown: the responses still in flight reflect the old rate.
+        now = time.monotonic()
+        if now - state["last_decrease"] < max(state["latency"] or 0.0, slot.delay, 1.0):
+            return
+
+        state["last_decrease"] = now
+        state["successes"] = 0
+        slot.concurrency = max(self.profile["min_concurrency"], slot.concurrency // 2)
+        slot.delay = min(self.profile["max_delay"], max(slot.delay * 2, self.profile["min_delay"], 0.5, retry_after))
+
+        self.stats.inc_value("throttle/decreases", spider=spider)
+        spider.logger.info(f"[THROTTLE] {key}: backing off to concurrency {slot.concurrency}, delay {slot.delay:.2f}s.")
+
+    def _increase(self, key, slot, state, spider):
+        # Additive step once a full window of requests at the current concurrency succeeded,
+        # as long as the recent error rate is acceptable.
+        state["successes"] += 1
+        if state["successes"] < slot.concurrency:
+            return
+        if sum(state["outcomes"]) / len(state["outcomes"]) > self.profile["max_error_rate"]:
+            return
+
+        state["successes"] = 0
+        if slot.concurrency >= self.profile["max_concurrency"] and slot.delay <= self.profile["min_delay"]:
+            return
+
+        slot.concurrency = min(self.profile["max_concurrency"], slot.concurrency + 1)
+        slot.delay = max(self.profile["min_delay"], slot.delay - self.profile["delay_step"])
+
+        self.stats.inc_value("throttle/increases", spider=spider)
+        spider.logger.debug(f"[THROTTLE] {key}: speeding up to concurrency {slot.concurrency}, delay {slot.delay:.2f}s.")
+
+    def _is_block_page(self, response):
+        if response.headers.get("cf-mitigated"):
+            return True
+        head = response.body[:4096].lower()
+        return any(title in head for title in self.BLOCK_PAGE_TITLES)
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.headers.get("Retry-After", b"0").decode("latin-1"))
+        except ValueError:
+            return 0.0
+
+
+class DeadlineMiddleware:
+    # Leaves low-priority work for the next run when the invocation is about to time out.
+    #
+    # Spiders opt in with a `deadline` attribute (epoch seconds). Once less than DEADLINE_RESERVE
+    # seconds remain, requests below DEADLINE_MIN_PRIORITY are dropped before they are downloaded,
+    # so the remaining time goes to live and imminent cards and the final flush. Requests with
+    # meta["deadline_exempt"] (listing pages, which may still lead to imminent cards) always go through.
+
+    def __init__(self, stats, reserve, min_priority):
+        self.stats = stats
+        self.reserve = reserve
+        self.min_priority = min_priority
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            crawler.stats,
+            crawler.settings.getfloat("DEADLINE_RESERVE"),
+            crawler.settings.getint("DEADLINE_MIN_PRIORITY"),
+        )
+
+    def process_request(self, request, spider):
+        deadline = getattr(spider, "deadline", None)
+        if not deadline or request.priority >= self.min_priority or request.meta.get("deadline_exempt"):
+            return None
+
+        remaining = deadline - time.time()
+        if remaining > self.reserve:
+            return None
+
+        self.stats.inc_value("deadline/deferred", spider=spider)
+        raise IgnoreRequest(f"Deferred to the next run, {remaining:.0f}s left before the deadline: {request.url}")
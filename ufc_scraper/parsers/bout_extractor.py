@@ -0,0 +1,192 @@
+from lxml import etree
+from parsel.csstranslator import css2xpath
+
+from ..utils.url_parser import UrlParser
+from ..utils.method_parser import MethodParser
+from ..utils.normalization import Normalizer
+from ..utils.weight_class_mapper import WeightClassMapper
+
+
+def _xpath(expression):
+    return etree.XPath(expression, smart_strings=False)
+
+
+def _css(query):
+    # Same translation parsel applies to response.css(), so results match the selector-based parsers.
+    return _xpath(css2xpath(query))
+
+
+class BoutExtractor:
+    """
+    Extracts every fight, fighter, result and odds field of a bout <li> straight from the lxml tree
+    with expressions compiled once at import time. Output matches EventPageParser.extract_bout_with_selectors.
+    """
+
+    WEB_VIEW = _xpath("./div[1]")
+
+    SUMMARY_DIV = _xpath(".//div[contains(@class, 'flex w-full mt-1 mb-0.5 px-1.5')]")
+    METHOD_TEXT = _css("span.uppercase::text")
+    ROUND_SUMMARY_TEXT = _css(r"span.text-xs11.md\:text-xs10.leading-relaxed::text")
+
+    PARTICIPANTS_DIV = _xpath("./div[@class='div group flex items:start justify-center gap-0.5 md:gap-0']")
+    CHILD_DIV_1 = _xpath("./div[1]")
+    CHILD_DIV_2 = _xpath("./div[2]")
+    CHILD_DIV_3 = _xpath("./div[3]")
+
+    FIGHTER_NAME = _css("a.link-primary-red::text")
+    FIGHTER_HREF = _css("a.link-primary-red::attr(href)")
+    FIGHTER_IMAGE = {
+        True: _css("div.relative.order-first img::attr(src)"),
+        False: _css("div.relative.order-last img::attr(src)"),
+    }
+    FIGHTER_RECORD = _xpath('.//span[contains(@class, "text-[15px]") and contains(@class, "md:text-xs") and contains(@class, "leading-tight")]/text()')
+    FIGHTER_RESULTS = [
+        (_css("span.text-blue-100.font-bold::text"), "draw"),
+        (_css("span.text-neutral-100.font-bold::text"), "no_contest"),
+        (_css("span.text-green-100.font-bold::text"), "win"),
+        (_css("span.text-red-100.font-bold::text"), "loss"),
+    ]
+
+    FIGHT_HREF = _xpath("./span[1]/a/@href")
+    BOUT_TYPE = _xpath("./span[1]/a/text()")
+    WEIGHT_CLASS_LBS = _xpath("./div[1]/span/text()")
+    ROUNDS_FORMAT = _xpath("./div[2]/text()")
+    FIGHT_ORDER = _xpath(".//span[2]/text()")
+
+    BOUT_DETAILS_DIV = _xpath("./div[@data-event-bout-details-target='content']")
+    ODDS_TABLE = _css("table#boutComparisonTable")
+    ODDS_ROW = _xpath(".//tr[td[contains(., 'Betting Odds')]]")
+    ODDS_TEXTS = _css(r"div.hidden.md\:inline::text")
+
+    @staticmethod
+    def _select(xpath, contexts):
+        # Same concatenation order as SelectorList.xpath()/css().
+        return [node for context in contexts for node in xpath(context)]
+
+    @staticmethod
+    def _first(xpath, contexts):
+        for context in contexts:
+            result = xpath(context)
+            if result:
+                return result[0]
+        return None
+
+    @staticmethod
+    def _text(xpath, contexts):
+        value = BoutExtractor._first(xpath, contexts)
+        return (value or "").strip() or None
+
+    @staticmethod
+    def extract(fight_element, response, auto_index):
+        select, text = BoutExtractor._select, BoutExtractor._text
+
+        web_view = BoutExtractor.WEB_VIEW(fight_element)
+
+        ### Fight summary ###
+        fight_summary_div = select(BoutExtractor.SUMMARY_DIV, web_view)
+        method_parsed = MethodParser.split_method(text(BoutExtractor.METHOD_TEXT, fight_summary_div))
+        round_summary = Normalizer.round_summary(text(BoutExtractor.ROUND_SUMMARY_TEXT, fight_summary_div))
+
+        fight_summary = {
+            "method_type": method_parsed["method_type"],
+            "method_detail": method_parsed["method_detail"],
+            "round_summary": round_summary,
+        }
+
+        ### Fighter infos ###
+        fight_participants_div = select(BoutExtractor.PARTICIPANTS_DIV, web_view)
+        fighter1_div = select(BoutExtractor.CHILD_DIV_1, fight_participants_div)
+        fighter2_div = select(BoutExtractor.CHILD_DIV_3, fight_participants_div)
+
+        fighter1_data = BoutExtractor.extract_fighter(fighter1_div, response, is_first_fighter=True)
+        fighter2_data = BoutExtractor.extract_fighter(fighter2_div, response, is_first_fighter=False)
+
+        ### Fight metadata ###
+        middle_div = select(BoutExtractor.CHILD_DIV_2, fight_participants_div)
+        box_div = select(BoutExtractor.CHILD_DIV_1, middle_div)
+        bout_details_button_div = select(BoutExtractor.CHILD_DIV_2, middle_div)
+
+        fight_relative_url = text(BoutExtractor.FIGHT_HREF, box_div)
+        fight_id = UrlParser.extract_fight_id(fight_relative_url)
+        if not fight_id:
+            return {"fight_id": None, "fight_relative_url": fight_relative_url}
+
+        weight_class_lbs = text(BoutExtractor.WEIGHT_CLASS_LBS, box_div)
+
+        fight_metadata = {
+            "fight_id": fight_id,
+            "bout_type": text(BoutExtractor.BOUT_TYPE, box_div),
+            "weight_class_lbs": weight_class_lbs,
+            "weight_class_id": WeightClassMapper.map_weight_class(weight_class_lbs),
+            "rounds_format": text(BoutExtractor.ROUNDS_FORMAT, box_div),
+            "fight_order": text(BoutExtractor.FIGHT_ORDER, bout_details_button_div) or str(auto_index),
+        }
+
+        ### Odds ###
+        bout_details_div = select(BoutExtractor.BOUT_DETAILS_DIV, web_view)
+        odds_data = BoutExtractor.extract_odds(bout_details_div)
+
+        return {
+            "fight_id": fight_id,
+            "fight_summary": fight_summary,
+            "fight_metadata": fight_metadata,
+            "fighter1": fighter1_data,
+            "fighter2": fighter2_data,
+            "odds": odds_data,
+        }
+
+    @staticmethod
+    def extract_fighter(fighter_div, response, is_first_fighter=True):
+        text = BoutExtractor._text
+
+        relative_url = text(BoutExtractor.FIGHTER_HREF, fighter_div)
+
+        result = "pending"
+        for xpath, color_result in BoutExtractor.FIGHTER_RESULTS:
+            if BoutExtractor._first(xpath, fighter_div):
+                result = color_result
+                break
+
+        record_after_fight = None
+        is_red_corner = None
+
+        if result != "pending":
+            record_after_fight_str = text(BoutExtractor.FIGHTER_RECORD, fighter_div)
+            if record_after_fight_str:
+                record_after_fight = Normalizer.record(record_after_fight_str)
+        else:
+            is_red_corner = is_first_fighter
+
+        return {
+            "fighter_id": UrlParser.extract_fighter_id(relative_url) if relative_url else None,
+            "name": text(BoutExtractor.FIGHTER_NAME, fighter_div),
+            "profile_url": response.urljoin(relative_url) if relative_url else None,
+            "image_url": text(BoutExtractor.FIGHTER_IMAGE[is_first_fighter], fighter_div),
+            "result": result,
+            "record_after_fight": record_after_fight,
+            "is_red_corner": is_red_corner,
+        }
+
+    @staticmethod
+    def extract_odds(bout_details_div):
+        table = BoutExtractor._select(BoutExtractor.ODDS_TABLE, bout_details_div)
+        odds_row = BoutExtractor._first(BoutExtractor.ODDS_ROW, table)
+
+        if odds_row is None:
+            return {
+                "fighter1_odds_value": None,
+                "fighter1_odds_label": None,
+                "fighter2_odds_value": None,
+                "fighter2_odds_label": None,
+            }
+
+        odds_texts = [o.strip() for o in BoutExtractor.ODDS_TEXTS(odds_row) if o.strip()]
+        f1_parsed = Normalizer.odds(odds_texts[0] if len(odds_texts) > 0 else None)
+        f2_parsed = Normalizer.odds(odds_texts[1] if len(odds_texts) > 1 else None)
+
+        return {
+            "fighter1_odds_value": f1_parsed["odds_value"],
+            "fighter1_odds_label": f1_parsed["odds_label"],
+            "fighter2_odds_value": f2_parsed["odds_value"],
+            "fighter2_odds_label": f2_parsed["odds_label"],
+        }
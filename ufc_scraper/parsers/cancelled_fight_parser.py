@@ -60,18 +60,18 @@ class CancelledFightParser:
             "is_red_corner": False,
         }
 
-        # Yield FightItem
+        # Yield FightRow
         yield ItemFactory.create_fight_item(
             fight_metadata,
             event_id,
             fight_summary,
         )
 
-        # Yield FighterItems
+        # Yield FighterRows
         for fighter_item in ItemFactory.create_fighter_items(fighter1_data, fighter2_data):
             yield fighter_item
 
-        # Yield ParticipationItems
+        # Yield ParticipationRows
         for participation_item in ItemFactory.create_participation_items(
             fight_id,
             fighter1_data,
@@ -1,15 +1,16 @@
+import hashlib
 import logging
 
+from .bout_extractor import BoutExtractor
 from .cancelled_fight_parser import CancelledFightParser
 from ..utils.item_factory import ItemFactory
 from ..utils.odds_parser import OddsParser
 from ..utils.fighter_div_parser import FighterDivParser
 from ..utils.url_parser import UrlParser
 from ..utils.method_parser import MethodParser
-from ..utils.datetime_parser import DatetimeParser
+from ..utils.normalization import Normalizer
 from ..utils.status_parser import StatusParser
 from ..utils.weight_class_mapper import WeightClassMapper
-from ..utils.round_parser import RoundParser
 
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ class EventPageParser:
         container = response.css('ul[data-controller="unordered-list-background"]')
 
         date_time_str = container.xpath(".//span[contains(text(), 'Date/Time')]/following-sibling::span/text()").get(default="").strip()
-        datetime_utc = DatetimeParser.parse(date_time_str)
+        datetime_utc = Normalizer.datetime_utc(date_time_str)
         venue = container.xpath(".//span[contains(text(), 'Venue')]/following-sibling::span/text()").get(default="").strip() or None
         location = container.xpath(".//span[contains(text(), 'Location')]/following-sibling::span//text()").get(default="").strip() or None
 
@@ -57,8 +58,60 @@ class EventPageParser:
             for cancelled_fight in cancelled_fights:
                 yield from CancelledFightParser.parse_cancelled_fight(cancelled_fight, response, event_id)
 
+    @staticmethod
+    def card_fingerprint(response):
+        """
+        Hash of the normalized text of every region parse_card reads. Markup churn outside the card
+        (ads, scripts, tokens) does not change the fingerprint; any change to parsed content does.
+        """
+        regions = response.xpath(
+            '//div[@id="eventPageHeader"]'
+            ' | //h2'
+            ' | //ul[@data-controller="unordered-list-background"]'
+            ' | //ul[@data-event-view-toggle-target="list"]/li[@data-controller="table-row-background"]'
+            ' | //div[starts-with(@id, "bout") and contains(@id, "Cancelled")]'
+        )
+
+        digest = hashlib.sha256()
+        for region in regions:
+            text = " ".join(region.xpath(".//text() | .//@href | .//@src | .//@class").getall())
+            digest.update(" ".join(text.split()).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
     @staticmethod
     def parse_single_fight(fight, response, event_id, auto_index, is_live_mode=False):
+        bout = BoutExtractor.extract(fight.root, response, auto_index)
+
+        if not bout["fight_id"]:
+            logger.error(f"Could not extract fight_id from URL: {bout['fight_relative_url']}")
+            return
+
+        ### yield items ###
+        yield ItemFactory.create_fight_item(
+            bout["fight_metadata"],
+            event_id,
+            bout["fight_summary"],
+        )
+
+        if not is_live_mode:
+            for fighter_item in ItemFactory.create_fighter_items(bout["fighter1"], bout["fighter2"]):
+                yield fighter_item
+
+        for participation_item in ItemFactory.create_participation_items(
+            bout["fight_id"],
+            bout["fighter1"],
+            bout["fighter2"],
+            bout["odds"],
+        ):
+            yield participation_item
+
+    @staticmethod
+    def extract_bout_with_selectors(fight, response, auto_index):
+        """
+        Selector-based extraction of a bout, one parsel query per field. Kept as the reference
+        implementation BoutExtractor is checked against (see benchmarks/bench_bout_extractor.py).
+        """
         web_view = fight.xpath("./div[1]")
 
         ### Fight summary ###
@@ -66,7 +119,7 @@ class EventPageParser:
         method_str = fight_summary_div.css("span.uppercase::text").get(default="").strip() or None
         method_parsed = MethodParser.split_method(method_str)
         round_summary_str = fight_summary_div.css(r"span.text-xs11.md\:text-xs10.leading-relaxed::text").get(default="").strip() or None
-        round_summary = RoundParser.standardize_round_summary(round_summary_str)
+        round_summary = Normalizer.round_summary(round_summary_str)
 
         fight_summary = {
             "method_type": method_parsed["method_type"],
@@ -90,8 +143,7 @@ class EventPageParser:
         fight_relative_url = box_div.xpath("./span[1]/a/@href").get(default="").strip() or None
         fight_id = UrlParser.extract_fight_id(fight_relative_url)
         if not fight_id:
-            logger.error(f"Could not extract fight_id from URL: {fight_relative_url}")
-            return
+            return {"fight_id": None, "fight_relative_url": fight_relative_url}
 
         bout_type = box_div.xpath("./span[1]/a/text()").get(default="").strip() or None
         weight_class_lbs = box_div.xpath("./div[1]/span/text()").get(default="").strip() or None
@@ -112,21 +164,11 @@ class EventPageParser:
         bout_details_div = web_view.xpath("./div[@data-event-bout-details-target='content']")
         odds_data = OddsParser.parse_odds(bout_details_div)
 
-        ### yield items ###
-        yield ItemFactory.create_fight_item(
-            fight_metadata,
-            event_id,
-            fight_summary,
-        )
-
-        if not is_live_mode:
-            for fighter_item in ItemFactory.create_fighter_items(fighter1_data, fighter2_data):
-                yield fighter_item
-
-        for participation_item in ItemFactory.create_participation_items(
-            fight_metadata["fight_id"],
-            fighter1_data,
-            fighter2_data,
-            odds_data,
-        ):
-            yield participation_item
+        return {
+            "fight_id": fight_id,
+            "fight_summary": fight_summary,
+            "fight_metadata": fight_metadata,
+            "fighter1": fighter1_data,
+            "fighter2": fighter2_data,
+            "odds": odds_data,
+        }
@@ -1,15 +1,60 @@
+import json
+import time
+import asyncio
 import logging
 from itemadapter import ItemAdapter
+from twisted.internet import task
 from scrapy.utils.defer import deferred_from_coro
 from .services.supabase_manager import SupabaseManager
+from .services.local_store import LocalStore
+from .services.row_fingerprints import RowFingerprintStore
+from .services.metrics import MetricsRegistry
+from .signals import rows_flushed
+from .items import RowMixin
 
 class DatabasePipeline:
 
-    def __init__(self):
-        self.supabase = SupabaseManager()
+    # Primary key columns of each buffered table, in the order of the buffer keys
+    PRIMARY_KEYS = {
+        "events": ("event_id",),
+        "fighters": ("fighter_id",),
+        "fights": ("fight_id",),
+        "participants": ("fight_id", "fighter_id"),
+    }
+
+    def __init__(self, fingerprints=None, stats=None, signals=None, streaming=False, max_rows=0, max_bytes=0, flush_interval=0,
+                 upsert_chunk_size=0, upsert_concurrency=1, writer="postgrest", copy_chunk_size=0):
+        self.supabase = SupabaseManager.shared()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.info("Unified DatabasePipeline initialized.")
 
+        # When set, rows identical to the last successful write are not sent again.
+        self.fingerprints = fingerprints
+        self.stats = stats
+        self.signals = signals
+
+        # Streaming mode writes buffered rows while the crawl runs, as soon as any threshold is hit.
+        # A threshold of 0 disables it; without streaming everything is written at close_spider.
+        self.streaming = streaming
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+
+        self.buffered_rows = 0
+        self.buffered_bytes = 0
+        self.last_flush = time.monotonic()
+        self.flush_loop = None
+        self.flush_lock = None
+
+        # Each table is sent in chunks of upsert_chunk_size rows (0 = one request), at most
+        # upsert_concurrency requests in flight per table.
+        self.upsert_chunk_size = upsert_chunk_size
+        self.upsert_concurrency = upsert_concurrency
+
+        # Write backend (see SupabaseManager.writer); COPY writes take much larger chunks.
+        self.writer = writer
+        self.copy_chunk_size = copy_chunk_size
+
         self.event_buffer = {}
         self.fight_buffer = {}
         self.fighter_buffer = {}
@@ -18,15 +63,60 @@ class DatabasePipeline:
         self.has_fighter_updates = False
 
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        fingerprints = None
+        if crawler.settings.getbool("ROW_DIFF_ENABLED"):
+            fingerprints = RowFingerprintStore(
+                LocalStore.from_settings(crawler.settings),
+                crawler.settings.getint("ROW_DIFF_MAX_AGE"),
+            )
+        return cls(
+            fingerprints=fingerprints,
+            stats=crawler.stats,
+            signals=crawler.signals,
+            streaming=crawler.settings.getbool("PIPELINE_STREAMING_FLUSH"),
+            max_rows=crawler.settings.getint("PIPELINE_FLUSH_MAX_ROWS"),
+            max_bytes=crawler.settings.getint("PIPELINE_FLUSH_MAX_BYTES"),
+            flush_interval=crawler.settings.getfloat("PIPELINE_FLUSH_INTERVAL"),
+            upsert_chunk_size=crawler.settings.getint("SUPABASE_UPSERT_CHUNK_SIZE"),
+            upsert_concurrency=crawler.settings.getint("SUPABASE_UPSERT_CONCURRENCY"),
+            writer=crawler.settings.get("SUPABASE_WRITER"),
+            copy_chunk_size=crawler.settings.getint("SUPABASE_COPY_CHUNK_SIZE"),
+        )
+
+
+    def open_spider(self, spider):
+        self.flush_lock = asyncio.Lock()
+        self.last_flush = time.monotonic()
+        # Spiders may ask for a tighter flush interval, like Scrapy's download_delay attribute.
+        self.flush_interval = getattr(spider, "flush_interval", self.flush_interval)
+        # -a writer=copy picks the write backend for this run only.
+        self.writer = getattr(spider, "writer", self.writer)
+        # Fail before crawling anything on a mistyped writer or a missing SUPABASE_DB_URL.
+        self.supabase.writer(self.writer)
+        self.logger.info(f"Writing through the {self.writer} writer.")
+
+        if self.streaming and self.flush_interval:
+            self.flush_loop = task.LoopingCall(self._flush_on_interval)
+            self.flush_loop.start(self.flush_interval, now=False)
+            self.logger.info(f"[STREAMING] Flushing every {self.max_rows} rows, {self.max_bytes} bytes or {self.flush_interval}s.")
+
+
     async def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
-        item_type = adapter.get("item_type")
+        if isinstance(item, RowMixin):
+            # Slotted rows from the card parsers already know their columns: no adapter, one dict.
+            item_type = item.item_type
+            item_data = item.to_row()
+        else:
+            adapter = ItemAdapter(item)
+            item_type = adapter.get("item_type")
 
-        if not item_type:
-            return item
+            if not item_type:
+                return item
 
-        item_data = adapter.asdict()
-        item_data.pop("item_type", None)
+            item_data = adapter.asdict()
+            item_data.pop("item_type", None)
 
         if item_type == "event":
             event_id = item_data.get("event_id")
@@ -55,46 +145,181 @@ class DatabasePipeline:
             if fight_id and fighter_id:
                 self.participation_buffer[(fight_id, fighter_id)] = item_data
 
+        if self.streaming:
+            self.buffered_rows += 1
+            self.buffered_bytes += len(json.dumps(item_data, default=str))
+
+            if self._flush_due():
+                self.logger.info(f"[STREAMING] Threshold reached ({self.buffered_rows} rows, {self.buffered_bytes} bytes). Flushing.")
+                await self._flush_all()
+
         return item
 
 
+    def _flush_due(self):
+        return bool(
+            (self.max_rows and self.buffered_rows >= self.max_rows)
+            or (self.max_bytes and self.buffered_bytes >= self.max_bytes)
+            or (self.flush_interval and time.monotonic() - self.last_flush >= self.flush_interval)
+        )
+
+
+    def _flush_on_interval(self):
+        if self.buffered_rows and self._flush_due():
+            return deferred_from_coro(self._flush_on_interval_async())
+
+
+    async def _flush_on_interval_async(self):
+        # Errors must not escape: a failing LoopingCall stops for good. Unwritten rows stay
+        # buffered and are retried by the next flush.
+        try:
+            self.logger.info(f"[STREAMING] Flush interval elapsed with {self.buffered_rows} buffered rows. Flushing.")
+            await self._flush_all()
+        except Exception as e:
+            self.logger.error(f"[STREAMING] Interval flush failed, will retry: {e}")
+
+
     def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+
         self.logger.info(f"[BATCH START] Processing buffered items: "
                          f"{len(self.event_buffer)} events, "
                          f"{len(self.fight_buffer)} fights, "
                          f"{len(self.fighter_buffer)} fighters, "
                          f"{len(self.participation_buffer)} participations")
 
-        return deferred_from_coro(self._flush_all())
+        return deferred_from_coro(self._close())
+
+
+    async def _close(self):
+        try:
+            await self._flush_all()
+        finally:
+            await self.supabase.close_writers()
 
 
     async def _flush_all(self):
-        if self.event_buffer:
-            await self.supabase.bulk_upsert("events", list(self.event_buffer.values()))
-            self.event_buffer.clear()
-
-        if self.fighter_buffer:
-            should_ignore_duplicates = not self.has_fighter_updates
-            mode_msg = "INSERT ONLY" if should_ignore_duplicates else "UPDATE"
-            self.logger.info(f"[FIGHTERS] Processing {len(self.fighter_buffer)} fighters in {mode_msg} mode.")
-            await self.supabase.bulk_upsert(
-                "fighters",
-                list(self.fighter_buffer.values()),
-                ignore_duplicates=should_ignore_duplicates
-            )
-            self.fighter_buffer.clear()
-            self.has_fighter_updates = False
-
-        if self.fight_buffer:
-            await self.supabase.bulk_upsert("fights", list(self.fight_buffer.values()))
-            self.fight_buffer.clear()
-
-        if self.participation_buffer:
-            await self.supabase.bulk_upsert(
-                "participants",
-                list(self.participation_buffer.values()),
-                on_conflict="fight_id, fighter_id"
-            )
-            self.participation_buffer.clear()
+        async with self.flush_lock:
+            # Take ownership of the current buffers so items arriving during the awaits below
+            # go into fresh buffers for the next flush.
+            events, self.event_buffer = self.event_buffer, {}
+            fighters, self.fighter_buffer = self.fighter_buffer, {}
+            fights, self.fight_buffer = self.fight_buffer, {}
+            participations, self.participation_buffer = self.participation_buffer, {}
+            has_fighter_updates, self.has_fighter_updates = self.has_fighter_updates, False
 
-        self.logger.info("[BATCH END] All items processed successfully.")
+            self.buffered_rows = 0
+            self.buffered_bytes = 0
+            self.last_flush = time.monotonic()
+
+            pending = {
+                "events": events,
+                "fighters": fighters,
+                "fights": fights,
+                "participants": participations,
+            }
+
+            changed = {}
+
+            async def write(table_name, **kwargs):
+                if pending[table_name]:
+                    changed[table_name] = await self._write_table(table_name, pending[table_name], **kwargs)
+                    pending[table_name] = {}
+
+            should_ignore_duplicates = not has_fighter_updates
+            if fighters:
+                mode_msg = "INSERT ONLY" if should_ignore_duplicates else "UPDATE"
+                self.logger.info(f"[FIGHTERS] Processing {len(fighters)} fighters in {mode_msg} mode.")
+
+            # FK-safe DAG: events and fighters have no dependencies and are written concurrently,
+            # fights need their event, participants need both their fight and fighter.
+            stages = [
+                [("events", {}), ("fighters", {"ignore_duplicates": should_ignore_duplicates})],
+                [("fights", {})],
+                [("participants", {"on_conflict": "fight_id, fighter_id"})],
+            ]
+
+            for stage in stages:
+                results = await asyncio.gather(*(write(table_name, **kwargs) for table_name, kwargs in stage), return_exceptions=True)
+                errors = [result for result in results if isinstance(result, Exception)]
+
+                if errors:
+                    self._restore_buffers(
+                        pending["events"], pending["fighters"], pending["fights"], pending["participants"], has_fighter_updates
+                    )
+                    raise errors[0]
+
+            self.logger.info("[BATCH END] All items processed successfully.")
+
+            if self.signals:
+                tables = {"events": events, "fighters": fighters, "fights": fights, "participants": participations}
+                self.signals.send_catch_log(
+                    signal=rows_flushed,
+                    tables={table_name: list(rows) for table_name, rows in tables.items() if rows},
+                    changed={table_name: keys for table_name, keys in changed.items() if keys},
+                )
+
+
+    def _restore_buffers(self, events, fighters, fights, participations, has_fighter_updates):
+        # Put back whatever was not written; newer items buffered meanwhile take precedence.
+        self.event_buffer = {**events, **self.event_buffer}
+        self.fighter_buffer = {**fighters, **self.fighter_buffer}
+        self.fight_buffer = {**fights, **self.fight_buffer}
+        self.participation_buffer = {**participations, **self.participation_buffer}
+        self.has_fighter_updates = self.has_fighter_updates or (has_fighter_updates and bool(fighters))
+        self.buffered_rows += len(events) + len(fighters) + len(fights) + len(participations)
+
+
+    async def _write_table(self, table_name, buffer, ignore_duplicates=False, on_conflict=None):
+        """Write a {primary_key: row} buffer. Returns the primary keys actually inserted or updated."""
+        if not self.fingerprints:
+            written = await self._upsert(table_name, list(buffer.values()), ignore_duplicates, on_conflict)
+            return self._written_keys(table_name, list(buffer), written, ignore_duplicates)
+
+        rows, fingerprints = self.fingerprints.diff(table_name, buffer)
+        skipped = len(buffer) - len(rows)
+        self.logger.info(f"[{table_name.upper()}] {len(rows)} changed, {skipped} unchanged rows skipped.")
+
+        if self.stats:
+            self.stats.inc_value(f"pipeline/{table_name}/rows_changed", len(rows))
+            self.stats.inc_value(f"pipeline/{table_name}/rows_unchanged", skipped)
+        MetricsRegistry.shared().increment("RowsSkipped", skipped, dimensions={"Table": table_name})
+
+        if not rows:
+            return []
+
+        written = await self._upsert(table_name, rows, ignore_duplicates, on_conflict)
+        self.fingerprints.commit(table_name, fingerprints)
+
+        keys = [key for key in buffer if RowFingerprintStore.row_key(key) in fingerprints]
+        return self._written_keys(table_name, keys, written, ignore_duplicates)
+
+
+    def _written_keys(self, table_name, keys, written, ignore_duplicates):
+        # With ignore_duplicates the database only returns the rows it inserted; existing ones were left alone.
+        if not ignore_duplicates:
+            return keys
+
+        columns = self.PRIMARY_KEYS[table_name]
+        inserted = {
+            tuple(row.get(column) for column in columns) if len(columns) > 1 else row.get(columns[0])
+            for row in written
+        }
+        return [key for key in keys if key in inserted]
+
+
+    async def _upsert(self, table_name, rows, ignore_duplicates, on_conflict):
+        metrics = MetricsRegistry.shared()
+        with metrics.timer("UpsertLatency", {"Table": table_name}):
+            written = await self.supabase.bulk_upsert(
+                table_name,
+                rows,
+                ignore_duplicates=ignore_duplicates,
+                on_conflict=on_conflict,
+                chunk_size=self.copy_chunk_size if self.writer == "copy" else self.upsert_chunk_size,
+                max_concurrency=self.upsert_concurrency,
+                writer=self.writer,
+            )
+        metrics.increment("RowsWritten", len(rows), dimensions={"Table": table_name})
+        return written
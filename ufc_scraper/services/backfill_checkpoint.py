@@ -0,0 +1,134 @@
+import time
+import zlib
+import logging
+
+
+class BackfillCheckpoint:
+    """
+    Progress of one shard of a historical backfill, kept in the LocalStore so a killed or
+    timed-out run resumes where it stopped.
+
+    The listing is newest-first, so events published between runs push older ones onto later
+    pages; page numbers are never checkpointed. Every run walks the listing from page 1 to the
+    first empty page and skips the events already done. Events are split between shards by a
+    stable hash of their id (shard k of n owns crc32(event_id) % n == k), so an event belongs to
+    the same shard wherever it is listed.
+
+    An event is checkpointed once its card has been parsed and every row it produced has been
+    reported by the rows_flushed signal. A walk that reaches the end with nothing left to
+    scrape marks the shard complete.
+    """
+
+    NAMESPACE_PREFIX = "backfill:"
+
+    def __init__(self, store, shard: int, shards: int):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store
+        self.shard = shard
+        self.shards = shards
+        self.namespace = f"{self.NAMESPACE_PREFIX}{shard}/{shards}"
+
+        self.end_page = None
+        self.events_scheduled = 0
+
+        self.page_events = {}
+        self.event_page = {}
+        self.outstanding = {}
+        self.row_owner = {}
+        self.parsed = set()
+
+        self.events_done = 0
+        self.pages_done = 0
+        self.started = time.monotonic()
+
+
+    def is_complete(self) -> bool:
+        return self.store.get(self.namespace, "complete") is not None
+
+
+    def owns(self, event_id: str) -> bool:
+        return zlib.crc32(event_id.encode("utf-8")) % self.shards == self.shard
+
+
+    def is_event_done(self, event_id: str) -> bool:
+        return self.store.get(self.namespace, f"event:{event_id}") is not None
+
+
+    def next_page(self, page: int = None):
+        """The listing page after `page` (or the first one), or None past the end of the listing."""
+        candidate = 1 if page is None else page + 1
+        if self.end_page and candidate >= self.end_page:
+            return None
+        return candidate
+
+
+    def mark_end(self, page: int):
+        # The first empty page of this walk. Only kept for the run: the listing grows between runs.
+        if not self.end_page or page < self.end_page:
+            self.end_page = page
+        if not self.events_scheduled:
+            self.store.set(self.namespace, "complete", time.time())
+            self.logger.info(f"[BACKFILL] Shard {self.shard}/{self.shards}: nothing left to scrape. Shard complete.")
+
+
+    def page_listed(self, page: int, event_ids: list):
+        """Register the events of a listing page that still have to be scraped."""
+        self.events_scheduled += len(event_ids)
+        self.page_events[page] = set(event_ids)
+        for event_id in event_ids:
+            self.event_page[event_id] = page
+            self.outstanding.setdefault(event_id, set())
+        if not event_ids:
+            self._complete_page(page)
+
+
+    def track(self, event_id: str, table_name: str, key):
+        """Register a row produced by an event's card, before it reaches the pipeline."""
+        self.outstanding.setdefault(event_id, set()).add((table_name, key))
+        self.row_owner[(table_name, key)] = event_id
+
+
+    def card_parsed(self, event_id: str):
+        self.parsed.add(event_id)
+        if not self.outstanding.get(event_id):
+            self._complete_event(event_id)
+
+
+    def rows_flushed(self, tables: dict):
+        for table_name, keys in tables.items():
+            for key in keys:
+                event_id = self.row_owner.pop((table_name, key), None)
+                if event_id is None:
+                    continue
+                rows = self.outstanding.get(event_id)
+                rows.discard((table_name, key))
+                if not rows and event_id in self.parsed:
+                    self._complete_event(event_id)
+
+
+    def throughput(self) -> float:
+        """Events checkpointed per minute in this run."""
+        elapsed = time.monotonic() - self.started
+        return self.events_done / elapsed * 60 if elapsed else 0.0
+
+
+    def _complete_event(self, event_id: str):
+        self.outstanding.pop(event_id, None)
+        self.parsed.discard(event_id)
+        self.store.set(self.namespace, f"event:{event_id}", time.time())
+        self.events_done += 1
+
+        page = self.event_page.pop(event_id, None)
+        if page is None:
+            return
+        remaining = self.page_events.get(page)
+        remaining.discard(event_id)
+        if not remaining:
+            self._complete_page(page)
+
+
+    def _complete_page(self, page: int):
+        self.page_events.pop(page, None)
+        self.pages_done += 1
+        self.logger.info(f"[BACKFILL] Shard {self.shard}/{self.shards}: page {page} done. "
+                         f"{self.pages_done} pages, {self.events_done} events this run ({self.throughput():.1f} events/min).")
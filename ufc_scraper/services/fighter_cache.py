@@ -0,0 +1,58 @@
+import time
+import logging
+
+
+class FighterCacheSnapshot:
+    """
+    Local snapshot of the fighters table's fighter_id -> name mapping.
+
+    Each load only fetches fighters whose updated_at is at or after the stored watermark, so
+    new and renamed fighters are picked up without paging through the whole table. A full
+    refresh runs when there is no snapshot yet or it is older than max_age, which also drops
+    fighters deleted upstream.
+    """
+
+    NAMESPACE = "fighter_cache"
+    META_NAMESPACE = "fighter_cache_meta"
+
+    def __init__(self, store, supabase, max_age: int):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store
+        self.supabase = supabase
+        self.max_age = max_age
+
+
+    async def load(self) -> dict:
+        meta = self.store.get(self.META_NAMESPACE, "state") or {}
+        full_refresh = not meta.get("watermark") or time.time() - meta.get("refreshed_at", 0) > self.max_age
+
+        started = time.perf_counter()
+        try:
+            rows = await self.supabase.get_fighter_names(None if full_refresh else meta["watermark"])
+        except Exception as e:
+            if full_refresh:
+                self.logger.error(f"Failed to load fighter cache: {e}")
+                return {}
+            self.logger.warning(f"Incremental fighter cache refresh failed, using the local snapshot as is: {e}")
+            rows = []
+
+        if full_refresh:
+            self.store.clear(self.NAMESPACE)
+            meta = {"refreshed_at": time.time()}
+
+        self.store.set_many(self.NAMESPACE, {row["fighter_id"]: row.get("name") for row in rows})
+
+        watermarks = [row["updated_at"] for row in rows if row.get("updated_at")]
+        if watermarks:
+            meta["watermark"] = max(watermarks + ([meta["watermark"]] if meta.get("watermark") else []))
+        self.store.set(self.META_NAMESPACE, "state", meta)
+
+        fighter_cache = {}
+        for fighter_id, name in self.store.items(self.NAMESPACE).items():
+            if name:
+                fighter_cache[name.strip()] = fighter_id
+
+        mode = "full" if full_refresh else "incremental"
+        self.logger.info(f"Loaded {len(fighter_cache)} fighters ({mode}, {len(rows)} fetched) "
+                         f"in {(time.perf_counter() - started) * 1000:.0f}ms.")
+        return fighter_cache
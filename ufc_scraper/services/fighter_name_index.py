@@ -0,0 +1,119 @@
+import re
+import difflib
+from unidecode import unidecode
+
+# Apostrophes and periods join ("O'Malley" -> "omalley", "Jr." -> "jr"), anything else separates.
+JOINING = re.compile(r"['.`]")
+SEPARATING = re.compile(r"[^a-z0-9]+")
+
+
+class FighterNameIndex:
+    """
+    Resolves ranking names against the fighter cache (name -> fighter_id), built once per run.
+
+    Lookups go from exact to loose, each one a dict lookup: NAME_EXCEPTIONS, the name itself,
+    the accent-folded and punctuation-normalized name, then the same with its tokens sorted
+    ("Zhang Weili" == "Weili Zhang"). Keys shared by several fighters are never used. Only
+    then is a fuzzy match tried, against at most max_candidates names that share a token (or a
+    token prefix) with the query, most shared first.
+
+    resolve() returns (fighter_id, matched_name, method, confidence), or None.
+    """
+
+    PREFIX_LENGTH = 4
+
+    def __init__(self, fighter_cache: dict, exceptions: dict | None = None, min_score=0.88, max_candidates=200):
+        self.fighter_cache = fighter_cache
+        self.exceptions = exceptions or {}
+        self.min_score = min_score
+        self.max_candidates = max_candidates
+
+        self.normalized = {}
+        self.token_sorted = {}
+        self.blocks = {}
+
+        for name, fighter_id in fighter_cache.items():
+            tokens = self.tokens(name)
+            if not tokens:
+                continue
+            self._add(self.normalized, " ".join(tokens), name, fighter_id)
+            self._add(self.token_sorted, " ".join(sorted(tokens)), name, fighter_id)
+
+        for key in self.token_sorted:
+            for token in key.split():
+                self.blocks.setdefault(token, set()).add(key)
+                self.blocks.setdefault(token[:self.PREFIX_LENGTH], set()).add(key)
+
+
+    @staticmethod
+    def tokens(name: str) -> list:
+        folded = unidecode(name).lower()
+        return SEPARATING.sub(" ", JOINING.sub("", folded)).split()
+
+
+    @staticmethod
+    def _add(index, key, name, fighter_id):
+        # Several fighters behind one key make it ambiguous: keep them all and never match on it.
+        index.setdefault(key, {})[fighter_id] = name
+
+
+    def resolve(self, name: str):
+        name = name.strip()
+
+        # Hand-kept exceptions win over everything, as they did before there was an index.
+        exception = self.exceptions.get(name)
+        if exception in self.fighter_cache:
+            return self.fighter_cache[exception], exception, "exception", 1.0
+
+        if name in self.fighter_cache:
+            return self.fighter_cache[name], name, "exact", 1.0
+
+        tokens = self.tokens(name)
+        if not tokens:
+            return None
+
+        for index, key, method, confidence in (
+            (self.normalized, " ".join(tokens), "normalized", 0.98),
+            (self.token_sorted, " ".join(sorted(tokens)), "token_order", 0.95),
+        ):
+            matches = index.get(key)
+            if matches and len(matches) == 1:
+                fighter_id, matched_name = next(iter(matches.items()))
+                return fighter_id, matched_name, method, confidence
+
+        return self._fuzzy(tokens)
+
+
+    def _fuzzy(self, tokens):
+        # Names sharing the most tokens and prefixes with the query come first; common surnames
+        # can block thousands of names, so only the best max_candidates are scored.
+        hits = {}
+        for token in set(tokens) | {token[:self.PREFIX_LENGTH] for token in tokens}:
+            for key in self.blocks.get(token, ()):
+                hits[key] = hits.get(key, 0) + 1
+
+        if not hits:
+            return None
+        # Ties break on the key: set iteration order changes with each process's string hash seed.
+        candidates = sorted(hits, key=lambda key: (-hits[key], key))[:self.max_candidates]
+
+        query = " ".join(sorted(tokens))
+        matcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        scored = []
+        for key in candidates:
+            matcher.set_seq1(key)
+            if matcher.real_quick_ratio() >= self.min_score and matcher.quick_ratio() >= self.min_score:
+                scored.append((matcher.ratio(), key))
+
+        scored.sort(reverse=True)
+        if not scored or scored[0][0] < self.min_score:
+            return None
+
+        score, key = scored[0]
+        matches = self.token_sorted[key]
+        # A runner-up about as close means the name cannot be told apart: better unresolved than wrong.
+        if len(matches) > 1 or (len(scored) > 1 and score - scored[1][0] < 0.03):
+            return None
+
+        fighter_id, matched_name = next(iter(matches.items()))
+        return fighter_id, matched_name, "fuzzy", round(score, 3)
@@ -0,0 +1,78 @@
+import logging
+
+
+class ListingFrontier:
+    """
+    Decides how far down the paginated promotion listing a run has to go.
+
+    Pages are followed until one is made only of events already known as completed and the
+    high-water mark (the newest completed event seen by the last clean run) has been passed.
+    A run stops after max_pages listing pages; the page it stopped at is kept as a catch-up
+    point that the next run resumes from once it has reached the frontier, so a cold start
+    converges over a few runs instead of needing manual single-event crawls.
+    """
+
+    NAMESPACE = "listing_frontier"
+
+    def __init__(self, store, max_pages: int):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store
+        self.max_pages = max_pages
+
+        state = store.get(self.NAMESPACE, "state") or {}
+        self.high_water_mark = state.get("high_water_mark")
+        self.catch_up_page = state.get("catch_up_page")
+
+        self.new_high_water_mark = None
+        self.high_water_mark_seen = not self.high_water_mark
+        self.catching_up = False
+        self.pages_fetched = 0
+
+
+    def visit(self, page: int, event_ids: list, completed_ids: set):
+        """
+        Record a parsed listing page (event ids in listing order, and those known as completed).
+        Returns the next page number to fetch, or None when the run should stop.
+        """
+        self.pages_fetched += 1
+
+        if self.new_high_water_mark is None and not self.catching_up:
+            self.new_high_water_mark = next((event_id for event_id in event_ids if event_id in completed_ids), None)
+
+        if self.high_water_mark in event_ids:
+            self.high_water_mark_seen = True
+
+        frontier_reached = not event_ids or (
+            set(event_ids) <= completed_ids and (self.high_water_mark_seen or self.catching_up)
+        )
+
+        if frontier_reached:
+            if self.catching_up:
+                self.logger.info(f"[LISTING FRONTIER] Catch-up finished at page {page}.")
+                self.catch_up_page = None
+                return None
+
+            if self.catch_up_page and self.catch_up_page > page and self.pages_fetched < self.max_pages:
+                self.logger.info(f"[LISTING FRONTIER] Frontier reached at page {page}. Resuming catch-up at page {self.catch_up_page}.")
+                self.catching_up = True
+                return self.catch_up_page
+
+            self.logger.info(f"[LISTING FRONTIER] Frontier reached at page {page}.")
+            return None
+
+        if self.pages_fetched >= self.max_pages:
+            self.logger.warning(f"[LISTING FRONTIER] Page budget of {self.max_pages} spent at page {page}. Next run catches up from page {page + 1}.")
+            self.catch_up_page = page + 1
+            return None
+
+        return page + 1
+
+
+    def commit(self):
+        state = {
+            "high_water_mark": self.new_high_water_mark or self.high_water_mark,
+            "catch_up_page": self.catch_up_page,
+        }
+        self.store.set(self.NAMESPACE, "state", state)
+        self.logger.info(f"[LISTING FRONTIER] {self.pages_fetched} listing pages fetched. "
+                         f"High-water mark: {state['high_water_mark']}, catch-up page: {state['catch_up_page']}.")
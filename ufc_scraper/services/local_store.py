@@ -0,0 +1,103 @@
+import os
+import json
+import sqlite3
+import logging
+
+DEFAULT_STORE_PATH = os.path.join("state", "ufc_scraper.sqlite3")
+
+
+class LocalStore:
+    """
+    Small namespaced key/value store on top of SQLite for state that must survive between runs
+    (response validators, snapshots, checkpoints). Values are stored as JSON.
+    """
+
+    _shared_instances = {}
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self.connection.commit()
+        self.logger.debug(f"Local store opened at {path}")
+
+
+    @classmethod
+    def shared(cls, path: str | None = None):
+        path = path or os.getenv("LOCAL_STORE_PATH") or DEFAULT_STORE_PATH
+        if path not in cls._shared_instances:
+            cls._shared_instances[path] = cls(path)
+        return cls._shared_instances[path]
+
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls.shared(settings.get("LOCAL_STORE_PATH"))
+
+
+    def get(self, namespace: str, key: str, default=None):
+        row = self.connection.execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+
+    def get_many(self, namespace: str, keys: list) -> dict:
+        result = {}
+        keys = list(keys)
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self.connection.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({placeholders})",
+                (namespace, *chunk),
+            )
+            result.update({key: json.loads(value) for key, value in rows})
+        return result
+
+
+    def items(self, namespace: str) -> dict:
+        rows = self.connection.execute("SELECT key, value FROM entries WHERE namespace = ?", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+
+    def set(self, namespace: str, key: str, value):
+        self.set_many(namespace, {key: value})
+
+
+    def set_many(self, namespace: str, mapping: dict):
+        if not mapping:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)",
+                [(namespace, key, json.dumps(value, separators=(",", ":"))) for key, value in mapping.items()],
+            )
+
+
+    def delete(self, namespace: str, keys: list):
+        if not keys:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys],
+            )
+
+
+    def clear(self, namespace: str):
+        with self.connection:
+            self.connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
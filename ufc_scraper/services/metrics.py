@@ -0,0 +1,118 @@
+import time
+from contextlib import contextmanager
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms for one crawl, keyed by metric name and dimensions.
+    Filled by the pipeline, SupabaseManager and the spider middleware, and emitted as CloudWatch
+    Embedded Metric Format documents by MetricsExtension when the spider closes. While disabled
+    (METRICS_ENABLED off) recording is a no-op, so a reused process does not accumulate metrics.
+    """
+
+    # CloudWatch accepts at most 100 distinct values per EMF metric
+    MAX_HISTOGRAM_VALUES = 100
+
+    _shared_instance = None
+
+    def __init__(self):
+        self.enabled = True
+        self.counters = {}
+        self.histograms = {}
+
+
+    @classmethod
+    def shared(cls):
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+
+    def reset(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        self.reset()
+
+
+    def increment(self, name: str, value=1, unit="Count", dimensions=None):
+        if not self.enabled:
+            return
+        key = (name, unit, self._dimension_key(dimensions))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+
+    def observe(self, name: str, value: float, unit="Milliseconds", dimensions=None):
+        if not self.enabled:
+            return
+        key = (name, unit, self._dimension_key(dimensions))
+        self.histograms.setdefault(key, []).append(value)
+
+
+    @contextmanager
+    def timer(self, name: str, dimensions=None):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000, dimensions=dimensions)
+
+
+    def to_emf(self, namespace: str, dimensions: dict, timestamp=None) -> list:
+        """One EMF document per dimension set; `dimensions` are added to all of them."""
+        documents = {}
+
+        for (name, unit, extra), value in self.counters.items():
+            document = self._document(documents, namespace, dimensions, extra, timestamp)
+            document["_aws"]["CloudWatchMetrics"][0]["Metrics"].append({"Name": name, "Unit": unit})
+            document[name] = value
+
+        for (name, unit, extra), values in self.histograms.items():
+            document = self._document(documents, namespace, dimensions, extra, timestamp)
+            document["_aws"]["CloudWatchMetrics"][0]["Metrics"].append({"Name": name, "Unit": unit})
+            document[name] = self._histogram(values)
+
+        return list(documents.values())
+
+
+    @staticmethod
+    def _dimension_key(dimensions):
+        return tuple(sorted((dimensions or {}).items()))
+
+
+    @staticmethod
+    def _document(documents, namespace, dimensions, extra, timestamp):
+        if extra not in documents:
+            all_dimensions = {**dimensions, **dict(extra)}
+            documents[extra] = {
+                "_aws": {
+                    "Timestamp": int((timestamp or time.time()) * 1000),
+                    "CloudWatchMetrics": [{
+                        "Namespace": namespace,
+                        "Dimensions": [list(all_dimensions)],
+                        "Metrics": [],
+                    }],
+                },
+                **{key: str(value) for key, value in all_dimensions.items()},
+            }
+        return documents[extra]
+
+
+    @classmethod
+    def _histogram(cls, values):
+        # Round to fewer significant digits until the distinct values fit in one EMF array.
+        for digits in (4, 3, 2, 1):
+            counts = {}
+            for value in values:
+                rounded = float(f"{value:.{digits}g}")
+                counts[rounded] = counts.get(rounded, 0) + 1
+            if len(counts) <= cls.MAX_HISTOGRAM_VALUES:
+                break
+
+        return {"Values": list(counts), "Counts": list(counts.values())}
@@ -0,0 +1,172 @@
+import io
+import time
+import pstats
+import inspect
+import cProfile
+import importlib
+import functools
+import tracemalloc
+
+
+class RunProfiler:
+    """
+    cProfile and tracemalloc for a selected set of functions, for one crawl.
+
+    Targets are dotted paths ("package.module.Class.method"). install() replaces each of them
+    with a wrapper that turns one shared profiler on while the target runs (per step for
+    generators, for the whole await for coroutines) and uninstall() puts the originals back,
+    so nothing is wrapped unless profiling was asked for. Coroutine timings include whatever
+    else ran on the event loop during their awaits; generators only count their own steps.
+    """
+
+    def __init__(self, targets, top_n=30):
+        self.targets = targets
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.depth = 0
+        self.calls = {}
+        self.wall_time = {}
+        self.originals = []
+        self.started_tracemalloc = False
+
+
+    def install(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self.started_tracemalloc = True
+
+        for target in self.targets:
+            owner, name = self._resolve(target)
+            original = inspect.getattr_static(owner, name)
+            function = original.__func__ if isinstance(original, (staticmethod, classmethod)) else original
+
+            wrapper = self._wrap(target, function)
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapper = type(original)(wrapper)
+
+            setattr(owner, name, wrapper)
+            self.originals.append((owner, name, original))
+
+
+    def uninstall(self):
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals = []
+
+
+    def write_reports(self, prof_path, report_path):
+        self.profile.dump_stats(prof_path)
+
+        report = io.StringIO()
+        report.write("Profiled targets (calls, wall time):\n")
+        for target in self.targets:
+            report.write(f"  {target}: {self.calls.get(target, 0)} calls, {self.wall_time.get(target, 0.0) * 1000:.1f}ms\n")
+
+        # pstats refuses a profile that never ran (no target was called during the crawl).
+        if not any(self.calls.values()):
+            report.write("\nNo profiled target ran; no function timings.\n")
+        else:
+            for sort_key in ("cumulative", "tottime"):
+                report.write(f"\nTop {self.top_n} functions by {sort_key}:\n")
+                pstats.Stats(self.profile, stream=report).strip_dirs().sort_stats(sort_key).print_stats(self.top_n)
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+            ])
+            report.write(f"\nTraced memory: {current / 1024:.0f} KiB current, {peak / 1024:.0f} KiB peak\n")
+            report.write(f"Top {self.top_n} allocation sites:\n")
+            for stat in snapshot.statistics("lineno")[:self.top_n]:
+                report.write(f"  {stat}\n")
+
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+
+
+    @staticmethod
+    def _resolve(target):
+        # Longest importable module prefix, then attributes down to the owner of the target.
+        parts = target.split(".")
+        for split in range(len(parts) - 1, 0, -1):
+            try:
+                owner = importlib.import_module(".".join(parts[:split]))
+            except ImportError:
+                continue
+            for attribute in parts[split:-1]:
+                owner = getattr(owner, attribute)
+            return owner, parts[-1]
+        raise ImportError(f"Cannot resolve profiling target '{target}'")
+
+
+    def _enable(self):
+        if self.depth == 0:
+            self.profile.enable()
+        self.depth += 1
+
+
+    def _disable(self):
+        self.depth -= 1
+        if self.depth == 0:
+            self.profile.disable()
+
+
+    def _record(self, target, elapsed):
+        self.calls[target] = self.calls.get(target, 0) + 1
+        self.wall_time[target] = self.wall_time.get(target, 0.0) + elapsed
+
+
+    def _wrap(self, target, function):
+        profiler = self
+
+        if inspect.isasyncgenfunction(function):
+            raise TypeError(f"Async generators cannot be profiled: {target}")
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                profiler._enable()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    profiler._disable()
+                    profiler._record(target, time.perf_counter() - started)
+
+        elif inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                # Only the generator's own steps count, not the consumer's work between them.
+                elapsed = 0.0
+                generator = function(*args, **kwargs)
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        profiler._enable()
+                        try:
+                            value = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            profiler._disable()
+                            elapsed += time.perf_counter() - started
+                        yield value
+                finally:
+                    profiler._record(target, elapsed)
+
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                profiler._enable()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    profiler._disable()
+                    profiler._record(target, time.perf_counter() - started)
+
+        return wrapper
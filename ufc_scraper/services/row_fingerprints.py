@@ -0,0 +1,57 @@
+import time
+import json
+import hashlib
+
+
+class RowFingerprintStore:
+    """
+    Remembers a stable hash of the last row written for each primary key, so unchanged rows
+    can be dropped before they are sent to the database. Snapshots live in the LocalStore and
+    expire after max_age seconds, after which the row is written again unconditionally.
+    """
+
+    NAMESPACE_PREFIX = "row_fingerprints:"
+
+    def __init__(self, store, max_age: int):
+        self.store = store
+        self.max_age = max_age
+
+
+    @staticmethod
+    def fingerprint(row: dict) -> str:
+        payload = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+    @staticmethod
+    def row_key(key) -> str:
+        return "|".join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+
+
+    def diff(self, table_name: str, buffer: dict):
+        """
+        Split a {primary_key: row} buffer into the rows that changed since the last write.
+        Returns (changed_rows, fingerprints) where fingerprints must be passed to commit()
+        once the write succeeded.
+        """
+        fingerprints = {self.row_key(key): self.fingerprint(row) for key, row in buffer.items()}
+        stored = self.store.get_many(self.NAMESPACE_PREFIX + table_name, fingerprints.keys())
+        now = time.time()
+
+        changed_rows = []
+        changed_fingerprints = {}
+        for key, row in buffer.items():
+            row_key = self.row_key(key)
+            previous = stored.get(row_key)
+
+            if previous and previous[0] == fingerprints[row_key] and now - previous[1] <= self.max_age:
+                continue
+
+            changed_rows.append(row)
+            changed_fingerprints[row_key] = [fingerprints[row_key], now]
+
+        return changed_rows, changed_fingerprints
+
+
+    def commit(self, table_name: str, fingerprints: dict):
+        self.store.set_many(self.NAMESPACE_PREFIX + table_name, fingerprints)
@@ -1,14 +1,22 @@
 import os
+import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
 from supabase import AsyncClient
 from dotenv import load_dotenv
+from .metrics import MetricsRegistry
+from .writers import WRITERS
 
 load_dotenv()
 
 class SupabaseManager:
 
+    _shared_instance = None
+
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        # SUPABASE_PROD_URL / SUPABASE_PROD_KEY: the PostgREST API. The copy writer also needs
+        # SUPABASE_DB_URL, a direct Postgres connection string (see services/writers.py).
         url = os.getenv("SUPABASE_PROD_URL")
         key = os.getenv("SUPABASE_PROD_KEY")
 
@@ -23,53 +31,173 @@ class SupabaseManager:
             self.logger.error(f"Failed to initialize Supabase client: {e}")
             raise e
 
+        # Write backends by name, created on first use and kept for the process like the client.
+        self.writers = {}
+
+
+    @classmethod
+    def shared(cls):
+        # Reuse one client per process so warm Lambda containers keep their HTTP connections.
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+
+    async def _execute(self, query, table_name: str, operation: str):
+        with MetricsRegistry.shared().timer("SupabaseQueryLatency", {"Table": table_name, "Operation": operation}):
+            return await query.execute()
+
+
+    def writer(self, name: str = "postgrest"):
+        if name not in self.writers:
+            if name not in WRITERS:
+                raise ValueError(f"Unknown writer '{name}'. Available: {', '.join(WRITERS)}")
+            self.writers[name] = WRITERS[name](self)
+        return self.writers[name]
 
-    async def bulk_upsert(self, table_name: str, data: list, ignore_duplicates=False, on_conflict=None):
+
+    async def close_writers(self):
+        # Releases connections (the copy writer's pool); a writer reconnects on its next use.
+        for writer in self.writers.values():
+            if hasattr(writer, "close"):
+                await writer.close()
+
+
+    async def bulk_upsert(self, table_name: str, data: list, ignore_duplicates=False, on_conflict=None, chunk_size=None, max_concurrency=1,
+                          writer="postgrest"):
+        """Upsert rows through the named writer. Returns the rows the database reports as written."""
         if not data:
-            return None
+            return []
 
         try:
-            response = await self.client.table(table_name).upsert(
-                data,
-                ignore_duplicates=ignore_duplicates,
-                on_conflict=on_conflict
-            ).execute()
+            rows = await self.writer(writer).upsert(table_name, data, ignore_duplicates, on_conflict, chunk_size, max_concurrency)
 
-            self.logger.debug(f"[{table_name.upper()}] Successfully upserted {len(data)} rows.")
-            return response
+            self.logger.debug(f"[{table_name.upper()}] Successfully upserted {len(data)} rows with the {writer} writer.")
+            return rows
 
         except Exception as e:
             self.logger.error(f"Error in bulk upsert for table '{table_name}': {e}")
             raise e
 
 
-    async def get_events_by_ids(self, event_ids: list):
-        if not event_ids:
-            return {}
+    async def get_recent_events(self, limit: int):
+        """event_id -> {status, datetime_utc} of the `limit` most recent events, newest (and undated) first."""
+        try:
+            events = {}
+            async for event in self.iter_rows('events', ('datetime_utc.desc.nullsfirst', 'event_id'), 'event_id, status, datetime_utc', max_rows=limit):
+                events[event.pop('event_id')] = event
+
+            self.logger.info(f"Fetched the status of {len(events)} recent events.")
+            return events
+
+        except Exception as e:
+            self.logger.error(f"Failed to get recent events: {e}")
+            raise e
+
+
+    async def get_fighters_pending_rescue(self, limit: int, updated_since=None, after=None):
+        """
+        Fighters inserted from a fight card whose profile has not been scraped yet (no record), by
+        fighter_id. Pass the last fighter_id of a page as `after` to get the next one.
+        """
+        try:
+            query = self.client.table("fighters")\
+                .select("fighter_id, profile_url")\
+                .is_("record", "null")\
+                .not_.is_("profile_url", "null")
+
+            if updated_since:
+                query = query.gte("updated_at", updated_since)
+            if after is not None:
+                query = query.gt("fighter_id", after)
+
+            response = await self._execute(query.order("fighter_id").limit(limit), "fighters", "select")
+
+            self.logger.info(f"Found {len(response.data)} fighters pending rescue.")
+            return response.data
+
+        except Exception as e:
+            self.logger.error(f"Failed to get fighters pending rescue: {e}")
+            raise e
+
+
+    async def claim_fighters_for_rescue(self, fighter_ids: list, lease_seconds: int):
+        """
+        Claim still-unscraped fighters for this rescue run; returns the fighter_ids claimed.
+
+        A fighter is claimable when fighters.rescue_claimed_at (timestamptz, nullable) is unset or older
+        than the lease. The conditional UPDATE is atomic per row, so two runs never claim the same fighter.
+        """
+        if not fighter_ids:
+            return []
+
+        now = datetime.now(timezone.utc)
+        expired = (now - timedelta(seconds=lease_seconds)).isoformat()
 
         try:
-            response = await self.client.table("events")\
-                .select("*")\
-                .in_("event_id", event_ids)\
-                .execute()
+            response = await self._execute(self.client.table("fighters")\
+                .update({"rescue_claimed_at": now.isoformat()})\
+                .in_("fighter_id", fighter_ids)\
+                .is_("record", "null")\
+                .or_(f'rescue_claimed_at.is.null,rescue_claimed_at.lt."{expired}"'), "fighters", "update")
+
+            claimed = sorted(row["fighter_id"] for row in response.data)
+            self.logger.info(f"Claimed {len(claimed)} of {len(fighter_ids)} fighters for rescue.")
+            return claimed
+
+        except Exception as e:
+            self.logger.error(f"Failed to claim fighters for rescue: {e}")
+            raise e
 
-            events_dict = {event["event_id"]: event for event in response.data}
 
-            self.logger.info(f"Fetched {len(events_dict)} events from {len(event_ids)} requested IDs")
-            return events_dict
+    async def get_rankings(self):
+        """(weight_class_id, rank_number) -> fighter_id of every stored rank."""
+        try:
+            rankings = {}
+            async for row in self.iter_rows('rankings', ('weight_class_id', 'rank_number'), 'weight_class_id, rank_number, fighter_id'):
+                rankings[(row['weight_class_id'], row['rank_number'])] = row['fighter_id']
+
+            self.logger.info(f"Fetched {len(rankings)} stored rankings.")
+            return rankings
 
         except Exception as e:
-            self.logger.error(f"Failed to get events: {e}")
+            self.logger.error(f"Failed to get rankings: {e}")
+            raise e
+
+
+    async def delete_rankings(self, keys: list):
+        """Delete ranks by (weight_class_id, rank_number), in one request."""
+        if not keys:
+            return None
+
+        ranks_by_division = {}
+        for weight_class_id, rank_number in keys:
+            ranks_by_division.setdefault(weight_class_id, []).append(rank_number)
+
+        conditions = ",".join(
+            f'and(weight_class_id.eq."{weight_class_id}",rank_number.in.({",".join(str(rank) for rank in sorted(ranks))}))'
+            for weight_class_id, ranks in ranks_by_division.items()
+        )
+
+        try:
+            response = await self._execute(self.client.table("rankings")\
+                .delete()\
+                .or_(conditions), "rankings", "delete")
+
+            self.logger.info(f"Deleted {len(keys)} stale rankings.")
+            return response
+
+        except Exception as e:
+            self.logger.error(f"Failed to delete rankings: {e}")
             raise e
 
 
     async def get_live_event(self):
         try:
-            response = await self.client.table("events")\
+            response = await self._execute(self.client.table("events")\
                 .select("event_id, event_url")\
                 .eq("status", "live")\
-                .limit(1)\
-                .execute()
+                .limit(1), "events", "select")
 
             if response.data:
                 return response.data[0]
@@ -82,35 +210,56 @@ class SupabaseManager:
             return None
 
 
-    async def load_fighter_cache(self):
-        fighter_cache = {}
-        batch_size = 1000
-        offset = 0
+    async def iter_rows(self, table_name: str, order_by: tuple, columns: str = "*", filters=None, page_size=1000, max_concurrency=4, max_rows=None):
+        """
+        Stream a table's rows as an async iterator, reading pages concurrently.
 
-        try:
-            self.logger.info("Loading fighter cache...")
+        An exact count is fetched first, then one range request per page is fanned out under a
+        semaphore. Pages are yielded as they arrive, so rows come in no particular order.
+        `filters` is an optional callable applied to each query builder (e.g. lambda q: q.eq(...)),
+        and `order_by` must give a stable total order so pages neither overlap nor skip rows.
+        Order columns use PostgREST's syntax, e.g. "datetime_utc.desc.nullsfirst".
+        """
+        def build_query(*args, **kwargs):
+            query = self.client.table(table_name).select(*args, **kwargs)
+            return filters(query) if filters else query
+
+        count_response = await self._execute(build_query(columns, count="exact", head=True), table_name, "count")
+        total = count_response.count or 0
+        if max_rows is not None:
+            total = min(total, max_rows)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
-            while True:
-                response = await self.client.table('fighters')\
-                    .select('fighter_id, name')\
-                    .range(offset, offset + batch_size - 1)\
-                    .execute()
+        async def fetch_page(offset):
+            async with semaphore:
+                query = build_query(columns)
+                for column in order_by:
+                    name, *modifiers = column.split(".")
+                    query = query.order(name, desc="desc" in modifiers, nullsfirst="nullsfirst" in modifiers)
+                response = await self._execute(query.range(offset, min(offset + page_size, total) - 1), table_name, "select")
+                return response.data
 
-                if not response.data:
-                    break
+        tasks = [asyncio.ensure_future(fetch_page(offset)) for offset in range(0, total, page_size)]
+        self.logger.debug(f"[{table_name.upper()}] Reading {total} rows in {len(tasks)} pages.")
 
-                for f in response.data:
-                    if f.get('name'):
-                        fighter_cache[f['name'].strip()] = f['fighter_id']
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                for row in await next_page:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
 
-                if len(response.data) < batch_size:
-                    break
 
-                offset += batch_size
+    async def get_fighter_names(self, updated_since=None):
+        try:
+            filters = (lambda query: query.gte('updated_at', updated_since)) if updated_since else None
+            rows = [row async for row in self.iter_rows('fighters', ('fighter_id',), 'fighter_id, name, updated_at', filters=filters)]
 
-            self.logger.info(f"Successfully loaded {len(fighter_cache)} fighters into cache.")
-            return fighter_cache
+            self.logger.info(f"Fetched {len(rows)} fighter names" + (f" updated since {updated_since}." if updated_since else "."))
+            return rows
 
         except Exception as e:
-            self.logger.error(f"Failed to load fighter cache: {e}")
-            return {}
+            self.logger.error(f"Failed to fetch fighter names: {e}")
+            raise e
@@ -0,0 +1,169 @@
+import io
+import os
+import json
+import asyncio
+import logging
+from .metrics import MetricsRegistry
+
+
+class PostgrestWriter:
+    """Upserts through PostgREST: JSON over HTTPS, one request per chunk. The default backend."""
+
+    name = "postgrest"
+
+    def __init__(self, manager):
+        self.manager = manager
+
+
+    async def upsert(self, table_name: str, rows: list, ignore_duplicates=False, on_conflict=None, chunk_size=None, max_concurrency=1) -> list:
+        chunk_size = chunk_size or len(rows)
+        chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def upsert_chunk(chunk):
+            async with semaphore:
+                return await self.manager._execute(self.manager.client.table(table_name).upsert(
+                    chunk,
+                    ignore_duplicates=ignore_duplicates,
+                    on_conflict=on_conflict
+                ), table_name, "upsert")
+
+        responses = await asyncio.gather(*(upsert_chunk(chunk) for chunk in chunks))
+        return [row for response in responses for row in response.data or []]
+
+
+class PostgresCopyWriter:
+    """
+    Upserts straight into Postgres for backfills and resyncs: each chunk is COPY'd (CSV) into a
+    temporary copy of the table and merged with INSERT ... ON CONFLICT in one transaction.
+
+    Needs asyncpg (imported on first use) and a direct connection string in SUPABASE_DB_URL.
+    Like PostgREST, the rows returned are the written rows' conflict columns, and with
+    ignore_duplicates only the ones actually inserted.
+    """
+
+    name = "copy"
+
+    def __init__(self, dsn: str, max_connections=4):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if not dsn:
+            raise ValueError("The copy writer needs SUPABASE_DB_URL (a direct Postgres connection string)")
+        self.dsn = dsn
+        self.max_connections = max_connections
+        self.pool = None
+        self.primary_keys = {}
+
+
+    @classmethod
+    def from_env(cls, manager):
+        return cls(os.getenv("SUPABASE_DB_URL"))
+
+
+    async def upsert(self, table_name: str, rows: list, ignore_duplicates=False, on_conflict=None, chunk_size=None, max_concurrency=1) -> list:
+        pool = await self._pool()
+        if on_conflict:
+            conflict_columns = [column.strip() for column in on_conflict.split(",")]
+        else:
+            conflict_columns = await self._primary_key(pool, table_name)
+
+        chunk_size = chunk_size or len(rows)
+        chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+        semaphore = asyncio.Semaphore(max(1, min(max_concurrency, self.max_connections)))
+
+        async def upsert_chunk(chunk):
+            async with semaphore:
+                with MetricsRegistry.shared().timer("SupabaseQueryLatency", {"Table": table_name, "Operation": "copy_upsert"}):
+                    async with pool.acquire() as connection:
+                        return await self._merge(connection, table_name, chunk, conflict_columns, ignore_duplicates)
+
+        results = await asyncio.gather(*(upsert_chunk(chunk) for chunk in chunks))
+        return [row for result in results for row in result]
+
+
+    async def close(self):
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+
+
+    async def _pool(self):
+        if self.pool is None:
+            try:
+                import asyncpg
+            except ImportError as e:
+                raise RuntimeError("The copy writer needs asyncpg: pip install asyncpg") from e
+
+            # statement_cache_size=0 keeps it usable behind Supabase's transaction-mode pooler.
+            self.pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.max_connections, statement_cache_size=0)
+            self.logger.info(f"Connected to Postgres for COPY writes (up to {self.max_connections} connections).")
+        return self.pool
+
+
+    async def _primary_key(self, pool, table_name):
+        if table_name not in self.primary_keys:
+            records = await pool.fetch(
+                "SELECT a.attname FROM pg_index i "
+                "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+                "WHERE i.indrelid = $1::regclass AND i.indisprimary ORDER BY array_position(i.indkey, a.attnum)",
+                f"public.{table_name}",
+            )
+            self.primary_keys[table_name] = [record["attname"] for record in records]
+        return self.primary_keys[table_name]
+
+
+    async def _merge(self, connection, table_name, rows, conflict_columns, ignore_duplicates):
+        # Columns in first-seen order; rows missing one get NULL, as in a PostgREST bulk upsert.
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        stage = f"_stage_{table_name}"
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        conflict_list = ", ".join(f'"{column}"' for column in conflict_columns)
+
+        if ignore_duplicates:
+            action = "DO NOTHING"
+        else:
+            updates = [f'"{column}" = EXCLUDED."{column}"' for column in columns if column not in conflict_columns]
+            action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+
+        async with connection.transaction():
+            # Only the written columns, with their types but none of the constraints; text COPY
+            # then lets Postgres cast every value to the real column type.
+            await connection.execute(
+                f'CREATE TEMP TABLE "{stage}" ON COMMIT DROP AS SELECT {column_list} FROM public."{table_name}" WITH NO DATA'
+            )
+            await connection.copy_to_table(
+                stage,
+                source=self._csv(rows, columns),
+                columns=columns,
+                format="csv",
+                null="",
+            )
+            records = await connection.fetch(
+                f'INSERT INTO public."{table_name}" ({column_list}) '
+                f'SELECT {column_list} FROM "{stage}" '
+                f'ON CONFLICT ({conflict_list}) {action} '
+                f'RETURNING {conflict_list}'
+            )
+        return [dict(record) for record in records]
+
+
+    def _csv(self, rows, columns):
+        # Every value is quoted and NULL is the only unquoted (empty) field, so no string, not even
+        # "" or "\\N", can be read back as NULL.
+        lines = [",".join(self._value(row.get(column)) for column in columns) for row in rows]
+        return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+    def _value(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        return '"' + str(value).replace('"', '""') + '"'
+
+
+WRITERS = {
+    PostgrestWriter.name: PostgrestWriter,
+    PostgresCopyWriter.name: PostgresCopyWriter.from_env,
+}
@@ -7,6 +7,8 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+
 BOT_NAME = "ufc_scraper"
 
 SPIDER_MODULES = ["ufc_scraper.spiders"]
@@ -22,7 +24,8 @@ ADDONS = {}
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-CONCURRENT_REQUESTS = 8
+# Per-domain concurrency is set by AdaptiveThrottleMiddleware (THROTTLE_PROFILES)
+CONCURRENT_REQUESTS = 16
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
@@ -46,21 +49,88 @@ COOKIES_ENABLED = False
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-# SPIDER_MIDDLEWARES = {
-#    "ufc_scraper.middlewares.UfcScraperSpiderMiddleware": 543,
-# }
+SPIDER_MIDDLEWARES = {
+    # Closest to the spider, so only the callback itself is timed
+    "ufc_scraper.middlewares.CallbackTimingMiddleware": 950,
+}
 
 # Enable or disable downloader middlewares
 DOWNLOADER_MIDDLEWARES = {
     'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
     'scrapy_user_agents.middlewares.RandomUserAgentMiddleware': 400,
+    # Below HttpCompressionMiddleware (590) so it sees decompressed bodies
+    'ufc_scraper.middlewares.ConditionalEventPageMiddleware': 560,
+    # Above RetryMiddleware (550) to see 429/503 before they are retried, below HttpCompressionMiddleware
+    'ufc_scraper.middlewares.AdaptiveThrottleMiddleware': 575,
+    'ufc_scraper.middlewares.DeadlineMiddleware': 50,
+}
+
+# Adaptive throttle: AIMD on per-domain concurrency and delay, driven by latency, errors,
+# 429/503 responses and block pages. The profile is picked by the spider's mode
+# (or throttle_profile attribute); latencies and delays are in seconds.
+THROTTLE_ENABLED = True
+THROTTLE_PROFILES = {
+    # Few pages, results needed within seconds
+    "live": {"target_latency": 1.5, "max_error_rate": 0.2, "start_concurrency": 4, "min_concurrency": 1,
+             "max_concurrency": 8, "start_delay": 0.25, "min_delay": 0.0, "max_delay": 10, "delay_step": 0.25},
+    "upcoming": {"target_latency": 2.5, "max_error_rate": 0.2, "start_concurrency": 2, "min_concurrency": 1,
+                 "max_concurrency": 4, "start_delay": 1.0, "min_delay": 0.5, "max_delay": 30, "delay_step": 0.25},
+    # Hundreds of pages with no deadline: stay well below anything that could get the crawler blocked
+    "backfill": {"target_latency": 3.0, "max_error_rate": 0.1, "start_concurrency": 1, "min_concurrency": 1,
+                 "max_concurrency": 3, "start_delay": 2.0, "min_delay": 1.5, "max_delay": 60, "delay_step": 0.25},
+    "default": {"target_latency": 2.5, "max_error_rate": 0.2, "start_concurrency": 2, "min_concurrency": 1,
+                "max_concurrency": 4, "start_delay": 1.5, "min_delay": 1.0, "max_delay": 60, "delay_step": 0.25},
 }
 
+# Local state that must survive between runs (validators, snapshots, checkpoints).
+# Lambda sets this to a path under /tmp so warm containers keep it.
+LOCAL_STORE_PATH = os.getenv("LOCAL_STORE_PATH", os.path.join("state", "ufc_scraper.sqlite3"))
+
+# Fighter name cache used by the ranking spider is kept locally and refreshed incrementally by updated_at.
+# A full reload (which also drops deleted fighters) happens at least this often (seconds)
+FIGHTER_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Fighter rescue runs claim the fighters they crawl (fighters.rescue_claimed_at, see migrations/). A claim older than
+# this (seconds) counts as abandoned, e.g. a failed profile crawl, and is taken over by the next rescue.
+RESCUE_CLAIM_LEASE = 5 * 60
+
+# Ranking names that match no fighter exactly (or via NAME_EXCEPTIONS) are folded and token-sorted,
+# then fuzzy-matched against at most RANKING_FUZZY_MAX_CANDIDATES fighters sharing a name token.
+# A fuzzy match needs at least RANKING_FUZZY_MIN_SCORE similarity (0-1)
+RANKING_FUZZY_MIN_SCORE = 0.88
+RANKING_FUZZY_MAX_CANDIDATES = 200
+
+# The ranking spider skips runs whose rankings page hashes the same as the last full write
+# (-a force=true overrides). The stored rankings are diffed again at least this often (seconds)
+RANKING_PAGE_MAX_AGE = 24 * 60 * 60
+
+# Conditional fetching of event pages in upcoming mode: unchanged cards are not re-parsed.
+CONDITIONAL_FETCH_ENABLED = True
+# Force a full parse of every card at least this often (seconds), even when unchanged
+CONDITIONAL_FETCH_MAX_AGE = 24 * 60 * 60
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-# EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-# }
+EXTENSIONS = {
+    "ufc_scraper.extensions.MetricsExtension": 500,
+    "ufc_scraper.extensions.ProfilingExtension": 510,
+}
+
+# Performance metrics printed as CloudWatch Embedded Metric Format JSON at spider close
+METRICS_ENABLED = True
+METRICS_NAMESPACE = "UfcScraper"
+
+# cProfile + tracemalloc around these functions, reported in PROFILE_OUTPUT_DIR at spider close.
+# Off unless PROFILE_ENABLED is set or the run passes -a profile=true.
+PROFILE_ENABLED = False
+# Lambda sets this to a path under /tmp; /var/task is read-only.
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "logs")
+PROFILE_TARGETS = [
+    "ufc_scraper.parsers.event_page_parser.EventPageParser.parse_card",
+    "ufc_scraper.utils.normalization.Normalizer.datetime_utc",
+    "ufc_scraper.pipelines.DatabasePipeline._flush_all",
+]
+PROFILE_TOP_N = 30
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -69,9 +139,60 @@ ITEM_PIPELINES = {
     'ufc_scraper.pipelines.DatabasePipeline': 100,
 }
 
+# Skip rows whose content is identical to the last successful write (fingerprints kept in LOCAL_STORE_PATH)
+ROW_DIFF_ENABLED = True
+# Rewrite unchanged rows at least this often (seconds) so manual edits in the database get corrected
+ROW_DIFF_MAX_AGE = 24 * 60 * 60
+
+# Write buffered rows while the crawl is running instead of only at close_spider.
+# A flush happens when any threshold is reached (0 disables that threshold).
+PIPELINE_STREAMING_FLUSH = True
+PIPELINE_FLUSH_MAX_ROWS = 500
+PIPELINE_FLUSH_MAX_BYTES = 1_000_000
+PIPELINE_FLUSH_INTERVAL = 60
+
+# Upcoming mode follows ?page=N of the promotion listing until it reaches a page of events already
+# known as completed. A run fetches at most this many listing pages and resumes deeper on the next run.
+LISTING_MAX_PAGES = 10
+# Upcoming mode decides what to scrape from the status of this many most recent events, fetched once
+# at start. Listing events outside it are treated as new and scraped.
+EVENT_STATUS_INDEX_SIZE = 1000
+
+# Event page request priorities (higher is fetched first). Imminent = starting within
+# EVENT_IMMINENT_WINDOW seconds (or already started), soon = within EVENT_SOON_WINDOW.
+EVENT_PRIORITIES = {"live": 300, "imminent": 200, "soon": 100, "new": 50, "distant": 0}
+EVENT_IMMINENT_WINDOW = 2 * 24 * 3600
+EVENT_SOON_WINDOW = 14 * 24 * 3600
+
+# With -a deadline=<epoch seconds>, requests below DEADLINE_MIN_PRIORITY are no longer started
+# once less than DEADLINE_RESERVE seconds are left; the next run picks them up. Listing pages are
+# exempt (meta["deadline_exempt"]), so pagination still reaches imminent cards.
+DEADLINE_RESERVE = 120
+DEADLINE_MIN_PRIORITY = 100
+
+# Live session (-a mode=live -a session=true): poll the live card until it ends or the budget runs out.
+# The interval backs off to the maximum right after a result and halves towards the minimum while nothing changes.
+LIVE_POLL_MIN_INTERVAL = 10
+LIVE_POLL_MAX_INTERVAL = 90
+# Stay inside Lambda's 15 minute limit, leaving time for the final flush
+LIVE_SESSION_MAX_DURATION = 13 * 60
+LIVE_SESSION_FLUSH_INTERVAL = 2
+
+# Tables are upserted in chunks of this many rows (0 = single request), with at most
+# SUPABASE_UPSERT_CONCURRENCY chunk requests in flight per table
+SUPABASE_UPSERT_CHUNK_SIZE = 250
+SUPABASE_UPSERT_CONCURRENCY = 4
+
+# Pipeline write backend: "postgrest" (JSON upserts over HTTPS) or "copy" (COPY into a temp table
+# and INSERT ... ON CONFLICT over a direct Postgres connection; needs asyncpg and SUPABASE_DB_URL).
+# Per run: -s SUPABASE_WRITER=copy or -a writer=copy. COPY writes use chunks of SUPABASE_COPY_CHUNK_SIZE rows
+SUPABASE_WRITER = "postgrest"
+SUPABASE_COPY_CHUNK_SIZE = 5000
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-AUTOTHROTTLE_ENABLED = True
+# Only used when the adaptive throttle is off; both would fight over the slot delay.
+AUTOTHROTTLE_ENABLED = not THROTTLE_ENABLED
 # The initial download delay
 AUTOTHROTTLE_START_DELAY = 2
 # The maximum download delay to be set in case of high latencies
@@ -0,0 +1,9 @@
+"""
+Project-specific signals, sent through crawler.signals like Scrapy's built-in ones.
+"""
+
+# Sent by DatabasePipeline after a flush has been written successfully.
+# Args: tables ({table_name: [primary keys]} of the rows now stored in the database),
+#       changed ({table_name: [primary keys]} of the rows this flush actually inserted or updated;
+#                rows skipped as unchanged, or existing fighters in insert-only mode, are left out)
+rows_flushed = object()
@@ -1,9 +1,10 @@
+import json
+import asyncio
 import scrapy
 
-from ..utils.date_parser import DateParser
-from ..utils.record_parser import RecordParser
+from ..services.supabase_manager import SupabaseManager
+from ..utils.normalization import Normalizer
 from ..utils.url_parser import UrlParser
-from ..utils.measurement_parser import MeasurementParser
 from ..utils.weight_class_mapper import WeightClassMapper
 from ..items import FighterItem
 
@@ -16,34 +17,142 @@ class FighterSpider(scrapy.Spider):
         self.fighter_id = kwargs.get('fighter_id')
         self.target_url = kwargs.get('profile_url')
 
+        # Batch rescue: (fighter_id, profile_url) pairs from a JSON file, an inline JSON list,
+        # or the fighters table (-a from_db=true).
+        self.targets_file = kwargs.get('targets_file')
+        self.targets = kwargs.get('targets')
+        self.from_db = str(kwargs.get('from_db', '')).lower() in ('1', 'true', 'yes')
+        self.batch_size = int(kwargs.get('batch_size', 100))
+        self.updated_since = kwargs.get('updated_since')
+
+        self.in_flight = 0
+        # Set whenever no profile request is in flight.
+        self.idle = asyncio.Event()
+        self.idle.set()
+
     async def start(self):
-        if self.target_url and self.fighter_id:
+        if self.from_db:
+            async for request in self._rescue_from_db():
+                yield request
+
+        elif self.targets_file or self.targets:
+            targets = self._load_targets()
+            self.logger.info(f"[RESCUE MODE] Starting batch scrape for {len(targets)} fighters")
+            for target in targets:
+                yield self._profile_request(target["fighter_id"], target["profile_url"])
+
+        elif self.target_url and self.fighter_id:
             self.logger.info(f"[RESCUE MODE] Starting scrape for Fighter ID: {self.fighter_id}")
-            yield scrapy.Request(
-                url=self.target_url,
-                callback=self.parse,
-                dont_filter=True
-            )
+            yield self._profile_request(self.fighter_id, self.target_url)
+
+        else:
+            self.logger.error("Missing required arguments! Usage: scrapy crawl fighter -a profile_url=... -a fighter_id=... "
+                              "(or -a targets_file=..., -a targets='[...]', -a from_db=true)")
+
+    async def _rescue_from_db(self):
+        # Concurrent rescues (one per webhook) each claim pending fighters before crawling them, so
+        # every fighter is crawled by exactly one run. A claim expires after RESCUE_CLAIM_LEASE seconds,
+        # so fighters whose crawl failed or whose run died are picked up again by a later rescue.
+        #
+        # The pending set is paged by fighter_id: failed profiles keep no record and would otherwise
+        # fill the first page forever. A pass that claimed anything is followed by another from the
+        # start, for fighters inserted while it was crawling; the run ends after a pass claims nothing.
+        supabase = SupabaseManager.shared()
+        lease = self.settings.getint("RESCUE_CLAIM_LEASE")
+        attempted = set()
+        cursor = None
+        claimed_in_pass = 0
+
+        while True:
+            pending = await supabase.get_fighters_pending_rescue(self.batch_size, self.updated_since, after=cursor)
+            if pending:
+                cursor = pending[-1]["fighter_id"]
+            if self.fighter_id and self.target_url and self.fighter_id not in attempted:
+                # The fighter that triggered this run may be outside the pending window; claim it anyway.
+                pending.append({"fighter_id": self.fighter_id, "profile_url": self.target_url})
+
+            if not pending:
+                if not claimed_in_pass:
+                    break
+                cursor, claimed_in_pass = None, 0
+                continue
+
+            targets = {target["fighter_id"]: target["profile_url"] for target in pending if target["fighter_id"] not in attempted}
+            claimed = await supabase.claim_fighters_for_rescue(list(targets), lease)
+            attempted.update(targets)
+            if not claimed:
+                continue
+
+            claimed_in_pass += len(claimed)
+            self.logger.info(f"[RESCUE MODE] Starting batch scrape for {len(claimed)} pending fighters "
+                             f"({len(targets) - len(claimed)} claimed elsewhere)")
+            for fighter_id in claimed:
+                yield self._profile_request(fighter_id, targets[fighter_id])
+
+            await self.idle.wait()
+
+        rescued = self.crawler.stats.get_value("rescue/fighters_requested", 0)
+        if attempted and not rescued:
+            self.logger.info(f"[RESCUE MODE] All {len(attempted)} pending fighters are claimed by other rescues.")
+            self.crawler.stats.set_value("rescue/deferred", 1)
+            return
+        self.logger.info(f"[RESCUE MODE] No pending fighters left. {rescued} rescued in this run.")
+
+    def _load_targets(self):
+        if self.targets_file:
+            with open(self.targets_file, encoding="utf-8") as f:
+                targets = json.load(f)
         else:
-            self.logger.error("Missing required arguments! Usage: scrapy crawl fighter -a url=... -a fighter_id=...")
+            targets = json.loads(self.targets)
+
+        # Accept [{"fighter_id": ..., "profile_url": ...}] as well as [[fighter_id, profile_url]]
+        return [
+            target if isinstance(target, dict) else {"fighter_id": target[0], "profile_url": target[1]}
+            for target in targets
+        ]
+
+    def _profile_request(self, fighter_id, profile_url):
+        self.in_flight += 1
+        self.idle.clear()
+        self.crawler.stats.inc_value("rescue/fighters_requested")
+        return scrapy.Request(
+            url=profile_url,
+            callback=self.parse,
+            errback=self._profile_failed,
+            cb_kwargs={"fighter_id": fighter_id},
+            dont_filter=True
+        )
+
+    def _profile_done(self):
+        self.in_flight -= 1
+        if not self.in_flight:
+            self.idle.set()
+
+    def _profile_failed(self, failure):
+        self._profile_done()
+        self.crawler.stats.inc_value("rescue/fighters_failed")
+        self.logger.error(f"[RESCUE MODE] Profile request failed: {failure.request.url} ({failure.value})")
+
+    async def parse(self, response, fighter_id=None):
+        if fighter_id:
+            self._profile_done()
 
-    async def parse(self, response):
         header = response.css("div#fighterPageHeader")
         container = response.css("div#standardDetails")
 
         nickname = self._extract_detail(container, "Nickname:")
 
         record_str = self._extract_detail(container, "Pro MMA Record:")
-        record = RecordParser.parse(record_str)
+        record = Normalizer.record(record_str)
 
         date_of_birth_str = self._extract_detail(container, "Date of Birth:")
-        date_of_birth = DateParser.parse_date_to_iso(date_of_birth_str)
+        date_of_birth = Normalizer.date_iso(date_of_birth_str)
 
         height_str = self._extract_detail(container, "Height:")
-        height = MeasurementParser.parse_measurement(height_str)
+        height = Normalizer.measurement(height_str)
 
         reach_str = self._extract_reach(container)
-        reach = MeasurementParser.parse_measurement(reach_str)
+        reach = Normalizer.measurement(reach_str)
 
         weight_class_name = self._extract_detail(container, "Weight Class:")
         weight_class_id = WeightClassMapper.map_weight_class(weight_class_name)
@@ -58,7 +167,7 @@ class FighterSpider(scrapy.Spider):
 
         fighter_item = FighterItem()
         fighter_item['item_type'] = "fighter_update"
-        fighter_item['fighter_id'] = self.fighter_id
+        fighter_item['fighter_id'] = fighter_id or self.fighter_id
         fighter_item['nickname'] = nickname
         fighter_item['record'] = record
         fighter_item['date_of_birth'] = date_of_birth
@@ -1,19 +1,32 @@
 import os
+import time
+import hashlib
 import logging
 from datetime import datetime
 import scrapy
 from ..services.supabase_manager import SupabaseManager
+from ..services.local_store import LocalStore
+from ..services.fighter_cache import FighterCacheSnapshot
+from ..services.fighter_name_index import FighterNameIndex
 from ..utils.ranking_mappings import WEIGHT_CLASS_MAPPING, NAME_EXCEPTIONS
 
 class RankingSpider(scrapy.Spider):
     name = "ranking"
     allowed_domains = ['ufc.com']
 
+    # Hash of the last rankings page that was written in full
+    STORE_NAMESPACE = "ranking_page"
+
     def __init__(self, *args, **kwargs):
         super(RankingSpider, self).__init__(*args, **kwargs)
-        self.supabase = SupabaseManager()
+        self.supabase = SupabaseManager.shared()
+        # force=true diffs and writes even when the page is unchanged since the last run.
+        self.force = str(kwargs.get('force', '')).lower() in ('1', 'true', 'yes')
         self.fighter_cache = {}
+        self.name_index = None
         self.rankings_buffer = []
+        # (weight_class_id, rank_number) of ranks on the page whose fighter could not be resolved
+        self.unresolved_ranks = set()
         self._setup_file_logger()
 
 
@@ -34,15 +47,96 @@ class RankingSpider(scrapy.Spider):
 
 
     async def start(self):
-        self.fighter_cache = await self.supabase.load_fighter_cache()
+        yield scrapy.Request(url='https://www.ufc.com/rankings', callback=self.parse)
+
+
+    async def load_name_index(self, store):
+        snapshot = FighterCacheSnapshot(
+            store,
+            self.supabase,
+            self.settings.getint("FIGHTER_CACHE_MAX_AGE"),
+        )
+        self.fighter_cache = await snapshot.load()
 
         if not self.fighter_cache:
             self.logger.error("⚠️ Fighter Cache is empty! Rankings might not link correctly.")
 
-        yield scrapy.Request(url='https://www.ufc.com/rankings', callback=self.parse)
+        self.name_index = self.build_name_index(self.fighter_cache)
+
+
+    def build_name_index(self, fighter_cache):
+        return FighterNameIndex(
+            fighter_cache,
+            NAME_EXCEPTIONS,
+            min_score=self.settings.getfloat("RANKING_FUZZY_MIN_SCORE"),
+            max_candidates=self.settings.getint("RANKING_FUZZY_MAX_CANDIDATES"),
+        )
 
 
     async def parse(self, response):
+        store = LocalStore.from_settings(self.settings)
+        page_hash = self.rankings_fingerprint(response)
+        previous = store.get(self.STORE_NAMESPACE, "state") or {}
+        fresh = time.time() - previous.get("stored_at", 0) <= self.settings.getint("RANKING_PAGE_MAX_AGE")
+
+        if previous.get("hash") == page_hash and fresh and not self.force:
+            self.crawler.stats.set_value("ranking/page_unchanged", 1)
+            self.logger.info("[RANKINGS] Page unchanged since the last write. Nothing to do.")
+            return
+
+        await self.load_name_index(store)
+        self.collect_rankings(response)
+
+        stored = await self.supabase.get_rankings()
+        upserts, deletes = self.diff_rankings(stored)
+        self.logger.info(f"[RANKINGS] {len(self.rankings_buffer)} ranks on the page: {len(upserts)} to write, "
+                         f"{len(deletes)} stale to delete, {len(self.unresolved_ranks)} unresolved left as stored.")
+
+        if upserts:
+            await self.supabase.bulk_upsert(
+                "rankings",
+                upserts,
+                on_conflict="weight_class_id,rank_number"
+            )
+        if deletes:
+            await self.supabase.delete_rankings(deletes)
+
+        self.crawler.stats.set_value("ranking/rows_written", len(upserts))
+        self.crawler.stats.set_value("ranking/rows_deleted", len(deletes))
+
+        # With unresolved names the page is diffed again next run, once the fighter cache may know them.
+        if not self.unresolved_ranks:
+            store.set(self.STORE_NAMESPACE, "state", {"hash": page_hash, "stored_at": time.time()})
+
+
+    def diff_rankings(self, stored):
+        """
+        Rows to upsert and (weight_class_id, rank_number) keys to delete so the stored rankings
+        match the page. Only divisions present on the page are touched, and ranks seen on the
+        page but left unresolved keep their stored fighter.
+        """
+        desired = {(row["weight_class_id"], row["rank_number"]): row for row in self.rankings_buffer}
+        divisions = {weight_class_id for weight_class_id, _ in desired} | {weight_class_id for weight_class_id, _ in self.unresolved_ranks}
+
+        upserts = [row for key, row in desired.items() if stored.get(key) != row["fighter_id"]]
+        deletes = [
+            key for key in stored
+            if key[0] in divisions and key not in desired and key not in self.unresolved_ranks
+        ]
+        return upserts, deletes
+
+
+    @staticmethod
+    def rankings_fingerprint(response):
+        # Division titles and ranked names in page order: markup, ads and tokens do not count.
+        digest = hashlib.sha256()
+        for text in response.css('.view-grouping-header::text, .info h5 a::text, .views-field-title a::text').getall():
+            digest.update(text.strip().encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+
+    def collect_rankings(self, response):
         groupings = response.css('.view-grouping')
 
         for group in groupings:
@@ -71,21 +165,20 @@ class RankingSpider(scrapy.Spider):
                     self.process_fighter(fighter_name, db_weight_class_id, current_rank)
                     current_rank += 1
 
-        if self.rankings_buffer:
-            await self.supabase.bulk_upsert(
-                "rankings",
-                self.rankings_buffer,
-                on_conflict="weight_class_id,rank_number"
-            )
-
 
     def process_fighter(self, fighter_name, weight_class_id, rank):
         fighter_name = fighter_name.strip()
+        match = self.name_index.resolve(fighter_name)
 
-        search_name = NAME_EXCEPTIONS.get(fighter_name, fighter_name)
-        found_id = self.fighter_cache.get(search_name)
+        if match:
+            found_id, matched_name, method, confidence = match
+            self.crawler.stats.inc_value(f"ranking/resolved/{method}")
+            if method == "exact":
+                self.logger.debug(f"Fighter matched: {fighter_name} -> {found_id}")
+            else:
+                # Worth a look, and a NAME_EXCEPTIONS entry if the match is wrong.
+                self.file_logger.warning(f"Fighter matched by {method} ({confidence:.2f}): {fighter_name} -> {matched_name} ({found_id})")
 
-        if found_id:
             data = {
                 "weight_class_id": weight_class_id,
                 "fighter_id": found_id,
@@ -94,5 +187,7 @@ class RankingSpider(scrapy.Spider):
             self.rankings_buffer.append(data)
             return True
         else:
+            self.unresolved_ranks.add((weight_class_id, rank))
+            self.crawler.stats.inc_value("ranking/unresolved")
             self.file_logger.warning(f"Fighter not found in DB: {fighter_name}")
             return False
@@ -1,20 +1,101 @@
+import time
+import asyncio
 import scrapy
+from datetime import datetime, timezone
+from scrapy import signals
+from itemadapter import ItemAdapter
 from ..utils.url_parser import UrlParser
+from ..services.local_store import LocalStore
+from ..services.listing_frontier import ListingFrontier
+from ..services.backfill_checkpoint import BackfillCheckpoint
 from ..services.supabase_manager import SupabaseManager
 from ..parsers.event_page_parser import EventPageParser
+from ..signals import rows_flushed
 
 
 class SmartSpider(scrapy.Spider):
 
     name = "smart"
     allowed_domains = ["tapology.com"]
+    listing_url = "https://www.tapology.com/fightcenter/promotions/1-ultimate-fighting-championship-ufc?page={page}"
 
     def __init__(self, *args, **kwargs):
         super(SmartSpider, self).__init__(*args, **kwargs)
-        self.supabase = SupabaseManager()
-        self.mode = kwargs.get('mode', 'upcoming')  # 'live', 'upcoming', or 'single'
+        self.supabase = SupabaseManager.shared()
+        self.mode = kwargs.get('mode', 'upcoming')  # 'live', 'upcoming', 'single' or 'backfill'
         self.event_url = kwargs.get('event_url')
 
+        # Live session: keep polling the live card and emit only fights whose outcome changed.
+        self.live_session = str(kwargs.get('session', '')).lower() in ('1', 'true', 'yes')
+        self.live_fight_state = {}
+        self.live_poll_interval = None
+        self.live_session_started = None
+
+        self.listing_frontier = None
+        # event_id -> {status, datetime_utc}, loaded once per run and kept current from the scraped event items.
+        self.event_index = {}
+
+        # Epoch seconds by which the run must be over (e.g. Lambda's timeout). DeadlineMiddleware
+        # stops starting low-priority requests when it gets close.
+        self.deadline = float(kwargs['deadline']) if kwargs.get('deadline') else None
+
+        # Backfill: this process scrapes shard `shard` (0-based) of `shards` of the listed events.
+        self.shard = int(kwargs.get('shard', 0))
+        self.shards = int(kwargs.get('shards', 1))
+        self.backfill = None
+
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+
+        if spider.live_session:
+            spider.live_poll_min_interval = crawler.settings.getfloat("LIVE_POLL_MIN_INTERVAL")
+            spider.live_poll_max_interval = crawler.settings.getfloat("LIVE_POLL_MAX_INTERVAL")
+            spider.live_session_max_duration = crawler.settings.getfloat("LIVE_SESSION_MAX_DURATION")
+            # With a deadline, the session also ends this long before it, like DeadlineMiddleware.
+            spider.deadline_reserve = crawler.settings.getfloat("DEADLINE_RESERVE")
+            # Picked up by DatabasePipeline so changed results are written within seconds.
+            spider.flush_interval = crawler.settings.getfloat("LIVE_SESSION_FLUSH_INTERVAL")
+
+        crawler.signals.connect(spider.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(spider.rows_flushed, signal=rows_flushed)
+        crawler.signals.connect(spider.item_scraped, signal=signals.item_scraped)
+        return spider
+
+
+    def item_scraped(self, item, response, spider):
+        adapter = ItemAdapter(item)
+        if adapter.get("item_type") == "event" and adapter.get("event_id"):
+            self.event_index[adapter["event_id"]] = {"status": adapter.get("status"), "datetime_utc": adapter.get("datetime_utc")}
+
+
+    def rows_flushed(self, tables):
+        if not self.backfill:
+            return
+
+        self.backfill.rows_flushed(tables)
+        self.crawler.stats.set_value("backfill/pages_done", self.backfill.pages_done)
+        self.crawler.stats.set_value("backfill/events_done", self.backfill.events_done)
+        self.crawler.stats.set_value("backfill/events_per_min", round(self.backfill.throughput(), 1))
+
+
+    def spider_closed(self, spider, reason):
+        if self.backfill:
+            self.logger.info(f"[BACKFILL] Shard {self.shard}/{self.shards} closed ({reason}): "
+                             f"{self.backfill.pages_done} pages and {self.backfill.events_done} events checkpointed "
+                             f"at {self.backfill.throughput():.1f} events/min.")
+
+        if not self.listing_frontier:
+            return
+
+        # Only a clean run may move the frontier, otherwise events it skipped past could be lost.
+        if reason != "finished" or self.crawler.stats.get_value("log_count/ERROR", 0):
+            self.logger.info(f"[LISTING FRONTIER] Crawl ended with '{reason}' or errors; keeping previous frontier.")
+            return
+
+        self.listing_frontier.commit()
+
 
     async def start(self):
         if self.mode == 'single':
@@ -45,29 +126,199 @@ class SmartSpider(scrapy.Spider):
             event_url = live_event.get("event_url")
 
             self.logger.info(f"[LIVE MODE] Scraping event: {event_id}")
+            if self.live_session:
+                self.live_session_started = time.monotonic()
+                self.live_poll_interval = self.live_poll_min_interval
+                self.logger.info(f"[LIVE SESSION] Polling for up to {self.live_session_max_duration:.0f}s.")
+
             yield scrapy.Request(
                 url=event_url,
                 callback=self.parse_live_event,
-                cb_kwargs={"event_id": event_id, "event_url": event_url}
+                cb_kwargs={"event_id": event_id, "event_url": event_url},
+                dont_filter=True,
+                priority=self.settings.getdict("EVENT_PRIORITIES")["live"]
             )
 
+        elif self.mode == 'backfill':
+            if not 0 <= self.shard < self.shards:
+                self.logger.error(f"[BACKFILL] Invalid shard {self.shard} of {self.shards}. Usage: -a mode=backfill -a shard=0 -a shards=4")
+                return
+
+            self.backfill = BackfillCheckpoint(LocalStore.from_settings(self.settings), self.shard, self.shards)
+            if self.backfill.is_complete():
+                self.logger.info(f"[BACKFILL] Shard {self.shard}/{self.shards} is already complete.")
+                return
+
+            self.logger.info(f"[BACKFILL] Shard {self.shard}/{self.shards} walking the listing from page 1.")
+            yield self.listing_request(self.backfill.next_page(), callback=self.parse_backfill_listing)
+
         else:
             self.logger.info("[UPCOMING MODE] Starting event pagination scrape...")
-            url = "https://www.tapology.com/fightcenter/promotions/1-ultimate-fighting-championship-ufc?page=1"
-            yield scrapy.Request(
-                url=url,
-                callback=self.parse_upcoming_events
-                )
+            self.listing_frontier = ListingFrontier(LocalStore.from_settings(self.settings), self.settings.getint("LISTING_MAX_PAGES"))
+            self.event_index = await self.supabase.get_recent_events(self.settings.getint("EVENT_STATUS_INDEX_SIZE"))
+            yield self.listing_request(1)
+
 
+    def listing_request(self, page, callback=None):
+        return scrapy.Request(
+            url=self.listing_url.format(page=page),
+            callback=callback or self.parse_upcoming_events,
+            cb_kwargs={"page": page},
+            # Pagination keeps going near the deadline; only the low-priority cards it finds are deferred.
+            meta={"deadline_exempt": True},
+        )
 
-    def parse_live_event(self, response, event_id, event_url):
+
+    async def parse_live_event(self, response, event_id, event_url):
 
         self.logger.debug(f"Parsing event status for {event_id}")
-        yield from EventPageParser.parse_card(response, event_id, event_url, is_live_mode=True)
+        items = list(EventPageParser.parse_card(response, event_id, event_url, is_live_mode=True))
+
+        if not self.live_session:
+            for item in items:
+                yield item
+            return
+
+        changed_items, changed_fights, pending_fights = self._diff_live_fights(items)
+        self.crawler.stats.inc_value("live_session/polls")
+        self.crawler.stats.inc_value("live_session/fights_changed", len(changed_fights))
+
+        for item in changed_items:
+            yield item
+
+        if changed_fights:
+            self.logger.info(f"[LIVE SESSION] {len(changed_fights)} fights changed: {', '.join(changed_fights)}")
+
+        if not pending_fights:
+            self.logger.info("[LIVE SESSION] No pending fights left on the card. Ending session.")
+            return
+
+        interval = self._next_poll_interval(bool(changed_fights))
+        elapsed = time.monotonic() - self.live_session_started
+        remaining = self.live_session_max_duration - elapsed
+        if self.deadline:
+            # Leave the final flush and validator writes time to finish before the invocation is killed.
+            remaining = min(remaining, self.deadline - time.time() - self.deadline_reserve)
+        if interval > remaining:
+            self.logger.info(f"[LIVE SESSION] Session budget reached after {elapsed:.0f}s. The next tick takes over.")
+            return
+
+        self.logger.debug(f"[LIVE SESSION] {len(pending_fights)} pending fights. Next poll in {interval:.0f}s.")
+        await asyncio.sleep(interval)
 
+        yield scrapy.Request(
+            url=event_url,
+            callback=self.parse_live_event,
+            cb_kwargs={"event_id": event_id, "event_url": event_url},
+            dont_filter=True,
+            priority=self.settings.getdict("EVENT_PRIORITIES")["live"]
+        )
 
-    async def parse_upcoming_events(self, response):
 
+    def _diff_live_fights(self, items):
+        fights = {}
+        for item in items:
+            adapter = ItemAdapter(item)
+            fight = fights.setdefault(adapter["fight_id"], {"fight": None, "participations": []})
+            if adapter["item_type"] == "fight":
+                fight["fight"] = item
+            else:
+                fight["participations"].append(adapter)
+
+        changed_items = []
+        changed_fights = []
+        pending_fights = []
+
+        for fight_id, fight in fights.items():
+            fight_item = ItemAdapter(fight["fight"]) if fight["fight"] else {}
+            state = (
+                fight_item.get("method_type"),
+                fight_item.get("method_detail"),
+                fight_item.get("round_summary"),
+                tuple(sorted((p["fighter_id"] or "", p["result"] or "") for p in fight["participations"])),
+            )
+
+            if any(p["result"] == "pending" for p in fight["participations"]):
+                pending_fights.append(fight_id)
+
+            if self.live_fight_state.get(fight_id) == state:
+                continue
+
+            self.live_fight_state[fight_id] = state
+            changed_fights.append(fight_id)
+            if fight["fight"]:
+                changed_items.append(fight["fight"])
+            changed_items.extend(p.item for p in fight["participations"])
+
+        return changed_items, changed_fights, pending_fights
+
+
+    def _next_poll_interval(self, fight_just_changed):
+        # Right after a result the next bout still has to walk out, so back off to the slowest rate.
+        # The longer nothing changes, the likelier a bout is about to end: halve the interval
+        # down to the fastest rate.
+        if fight_just_changed:
+            self.live_poll_interval = self.live_poll_max_interval
+        else:
+            self.live_poll_interval = max(self.live_poll_min_interval, self.live_poll_interval / 2)
+        return self.live_poll_interval
+
+
+    def parse_upcoming_events(self, response, page=1):
+
+        event_data_list = self.extract_listing_events(response)
+        event_ids = [item["event_id"] for item in event_data_list]
+        completed_ids = set()
+
+        if event_data_list:
+            for event_data in event_data_list:
+                event_id = event_data["event_id"]
+                event_url = event_data["event_url"]
+
+                indexed_event = self.event_index.get(event_id) or {}
+                status = indexed_event.get("status")
+
+                if not status or status == "Upcoming":
+                    priority = self.event_priority(indexed_event)
+                    self.logger.info(f"Event {event_id} is new or upcoming. Scheduling full page scrape (priority {priority}).")
+
+                    yield scrapy.Request(
+                        url=event_url,
+                        callback=EventPageParser.parse_card,
+                        cb_kwargs={"event_id": event_id, "event_url": event_url},
+                        meta={"validator_key": event_id},
+                        priority=priority,
+                    )
+                else:
+                    self.logger.debug(f"Event {event_id} is already completed. Skipping.")
+                    completed_ids.add(event_id)
+
+        if self.listing_frontier:
+            next_page = self.listing_frontier.visit(page, event_ids, completed_ids)
+            if next_page:
+                yield self.listing_request(next_page)
+
+
+    def event_priority(self, event):
+        # Cards about to start first, then the next two weeks. New events we know nothing about
+        # come next; cards months out go last. Live cards are polled by live mode at priority "live".
+        priorities = self.settings.getdict("EVENT_PRIORITIES")
+        if not event.get("datetime_utc"):
+            return priorities["new"]
+
+        starts_at = datetime.fromisoformat(event["datetime_utc"])
+        if starts_at.tzinfo is None:
+            starts_at = starts_at.replace(tzinfo=timezone.utc)
+
+        starts_in = (starts_at - datetime.now(timezone.utc)).total_seconds()
+        if starts_in < self.settings.getint("EVENT_IMMINENT_WINDOW"):
+            return priorities["imminent"]
+        if starts_in < self.settings.getint("EVENT_SOON_WINDOW"):
+            return priorities["soon"]
+        return priorities["distant"]
+
+
+    def extract_listing_events(self, response):
         events = response.css('div[data-controller="bout-toggler"]')
         self.logger.info(f"Found {len(events)} events on page {response.url}")
 
@@ -92,23 +343,56 @@ class SmartSpider(scrapy.Spider):
 
             event_data_list.append({"event_id": event_id, "event_url": event_url})
 
-        if event_data_list:
-            event_ids = [item["event_id"] for item in event_data_list]
-            existing_events = await self.supabase.get_events_by_ids(event_ids)
+        return event_data_list
 
-            for event_data in event_data_list:
-                event_id = event_data["event_id"]
-                event_url = event_data["event_url"]
 
-                existing_event = existing_events.get(event_id)
+    def parse_backfill_listing(self, response, page):
+        if not response.css('div[data-controller="bout-toggler"]'):
+            self.logger.info(f"[BACKFILL] Listing page {page} is empty. End of the listing reached.")
+            self.backfill.mark_end(page)
+            return
 
-                if not existing_event or existing_event.get("status") == "Upcoming":
-                    self.logger.info(f"Event {event_id} is new or upcoming. Scheduling full page scrape.")
+        pending_events = [
+            event for event in self.extract_listing_events(response)
+            if self.backfill.owns(event["event_id"]) and not self.backfill.is_event_done(event["event_id"])
+        ]
+        self.backfill.page_listed(page, [event["event_id"] for event in pending_events])
+        self.crawler.stats.inc_value("backfill/pages_listed")
+        self.crawler.stats.inc_value("backfill/events_scheduled", len(pending_events))
 
-                    yield scrapy.Request(
-                        url=event_url,
-                        callback=EventPageParser.parse_card,
-                        cb_kwargs={"event_id": event_id, "event_url": event_url},
-                    )
-                else:
-                    self.logger.debug(f"Event {event_id} is already completed. Skipping.")
+        for event_data in pending_events:
+            yield scrapy.Request(
+                url=event_data["event_url"],
+                callback=self.parse_backfill_card,
+                cb_kwargs={"event_id": event_data["event_id"], "event_url": event_data["event_url"]},
+            )
+
+        next_page = self.backfill.next_page(page)
+        if next_page:
+            yield self.listing_request(next_page, callback=self.parse_backfill_listing)
+
+
+    def parse_backfill_card(self, response, event_id, event_url):
+        # Rows are registered before they reach the pipeline, so a flush can never report them first.
+        for item in EventPageParser.parse_card(response, event_id, event_url):
+            row = self._row_key(item)
+            if row:
+                self.backfill.track(event_id, *row)
+            yield item
+
+        self.backfill.card_parsed(event_id)
+
+
+    @staticmethod
+    def _row_key(item):
+        # Same tables and primary keys as DatabasePipeline's buffers. Fighters are left out:
+        # participants are written after them, so a flushed participation implies its fighter.
+        item = ItemAdapter(item)
+        item_type = item.get("item_type")
+        if item_type == "event" and item.get("event_id"):
+            return "events", item["event_id"]
+        if item_type == "fight" and item.get("fight_id"):
+            return "fights", item["fight_id"]
+        if item_type == "participation" and item.get("fight_id") and item.get("fighter_id"):
+            return "participants", (item["fight_id"], item["fighter_id"])
+        return None
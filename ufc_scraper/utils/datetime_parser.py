@@ -2,6 +2,11 @@ from dateutil import parser
 from zoneinfo import ZoneInfo
 import logging
 
+# Built once: ZoneInfo lookups are cached by key, but not free.
+EASTERN = ZoneInfo("America/New_York")
+UTC = ZoneInfo("UTC")
+TZINFOS = {"ET": EASTERN}
+
 
 class DatetimeParser:
 
@@ -12,18 +17,14 @@ class DatetimeParser:
             return None
 
         try:
-            eastern = ZoneInfo("America/New_York")
-
-            tzinfos = {"ET": eastern}
-
-            dt = parser.parse(date_time_str, fuzzy=True, tzinfos=tzinfos)
+            dt = parser.parse(date_time_str, fuzzy=True, tzinfos=TZINFOS)
 
             if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=eastern)
+                dt = dt.replace(tzinfo=EASTERN)
             else:
-                dt = dt.astimezone(eastern)
+                dt = dt.astimezone(EASTERN)
 
-            dt_utc = dt.astimezone(ZoneInfo("UTC"))
+            dt_utc = dt.astimezone(UTC)
             return dt_utc.isoformat()
 
         except Exception as e:
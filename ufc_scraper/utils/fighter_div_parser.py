@@ -1,6 +1,6 @@
 from .result_parser import ResultParser
 from .url_parser import UrlParser
-from .record_parser import RecordParser
+from .normalization import Normalizer
 
 
 class FighterDivParser:
@@ -24,7 +24,7 @@ class FighterDivParser:
             record_after_fight_str = fighter_div.xpath('.//span[contains(@class, "text-[15px]") and contains(@class, "md:text-xs") and contains(@class, "leading-tight")]/text()').get(default="").strip() or None
 
             if record_after_fight_str:
-                record_after_fight = RecordParser.parse(record_after_fight_str)
+                record_after_fight = Normalizer.record(record_after_fight_str)
 
         else:
             is_red_corner = is_first_fighter
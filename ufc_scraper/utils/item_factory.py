@@ -1,4 +1,4 @@
-from ..items import EventItem, FightItem, FightParticipationItem, FighterItem
+from ..items import EventRow, FightRow, FighterRow, ParticipationRow
 
 
 class ItemFactory:
@@ -6,47 +6,44 @@ class ItemFactory:
     @staticmethod
     def create_event_item(event_id, event_url, name, status, datetime_utc, venue, location):
 
-        event_item = EventItem()
-        event_item["item_type"] = "event"
-        event_item["event_id"] = event_id
-        event_item["event_url"] = event_url
-        event_item["name"] = name
-        event_item["status"] = status
-        event_item["datetime_utc"] = datetime_utc
-        event_item["venue"] = venue
-        event_item["location"] = location
-        return event_item
+        return EventRow(
+            event_id=event_id,
+            event_url=event_url,
+            name=name,
+            status=status,
+            datetime_utc=datetime_utc,
+            venue=venue,
+            location=location,
+        )
 
     @staticmethod
     def create_fight_item(fight_metadata, event_id, fight_summary):
 
-        fight_item = FightItem()
-        fight_item["item_type"] = "fight"
-        fight_item["fight_id"] = fight_metadata.get("fight_id")
-        fight_item["event_id"] = event_id
-        fight_item["method_type"] = fight_summary.get("method_type")
-        fight_item["method_detail"] = fight_summary.get("method_detail")
-        fight_item["round_summary"] = fight_summary.get("round_summary")
-        fight_item["bout_type"] = fight_metadata.get("bout_type")
-        fight_item["weight_class_lbs"] = fight_metadata.get("weight_class_lbs")
-        fight_item["weight_class_id"] = fight_metadata.get("weight_class_id")
-        fight_item["rounds_format"] = fight_metadata.get("rounds_format")
-        fight_item["fight_order"] = fight_metadata.get("fight_order")
-        return fight_item
+        return FightRow(
+            fight_id=fight_metadata.get("fight_id"),
+            event_id=event_id,
+            method_type=fight_summary.get("method_type"),
+            method_detail=fight_summary.get("method_detail"),
+            round_summary=fight_summary.get("round_summary"),
+            bout_type=fight_metadata.get("bout_type"),
+            weight_class_lbs=fight_metadata.get("weight_class_lbs"),
+            weight_class_id=fight_metadata.get("weight_class_id"),
+            rounds_format=fight_metadata.get("rounds_format"),
+            fight_order=fight_metadata.get("fight_order"),
+        )
 
     @staticmethod
     def create_fighter_items(fighter1_data, fighter2_data):
 
-        items = []
-        for fighter_data in [fighter1_data, fighter2_data]:
-            fighter_item = FighterItem()
-            fighter_item["item_type"] = "fighter"
-            fighter_item["fighter_id"] = fighter_data.get("fighter_id")
-            fighter_item["name"] = fighter_data.get("name")
-            fighter_item["profile_url"] = fighter_data.get("profile_url")
-            fighter_item["image_url"] = fighter_data.get("image_url")
-            items.append(fighter_item)
-        return items
+        return [
+            FighterRow(
+                fighter_id=fighter_data.get("fighter_id"),
+                name=fighter_data.get("name"),
+                profile_url=fighter_data.get("profile_url"),
+                image_url=fighter_data.get("image_url"),
+            )
+            for fighter_data in (fighter1_data, fighter2_data)
+        ]
 
     @staticmethod
     def create_participation_items(
@@ -75,14 +72,13 @@ class ItemFactory:
                 result2 or fighter2_data.get("result"),
             ),
         ]:
-            participation = FightParticipationItem()
-            participation["item_type"] = "participation"
-            participation["fight_id"] = fight_id
-            participation["fighter_id"] = fighter_data.get("fighter_id")
-            participation["odds_value"] = odds_value
-            participation["odds_label"] = odds_label
-            participation["result"] = result
-            participation["record_after_fight"] = fighter_data.get("record_after_fight")
-            participation["is_red_corner"] = fighter_data.get("is_red_corner")
-            items.append(participation)
+            items.append(ParticipationRow(
+                fight_id=fight_id,
+                fighter_id=fighter_data.get("fighter_id"),
+                odds_value=odds_value,
+                odds_label=odds_label,
+                result=result,
+                record_after_fight=fighter_data.get("record_after_fight"),
+                is_red_corner=fighter_data.get("is_red_corner"),
+            ))
         return items
@@ -1,5 +1,8 @@
 import re
 
+IMPERIAL = re.compile(r'^(.+?)\s*\(')
+METRIC = re.compile(r'\((\d+\.?\d*)cm\)')
+
 
 class MeasurementParser:
 
@@ -19,11 +22,11 @@ class MeasurementParser:
             return {"imperial": None, "metric": None}
 
         # Extract imperial (everything before opening parenthesis)
-        imperial_match = re.search(r'^(.+?)\s*\(', measurement_str)
+        imperial_match = IMPERIAL.search(measurement_str)
         imperial = imperial_match.group(1).strip() if imperial_match else measurement_str.strip()
 
         # Extract metric value (number inside parenthesis before 'cm')
-        metric_match = re.search(r'\((\d+\.?\d*)cm\)', measurement_str)
+        metric_match = METRIC.search(measurement_str)
         metric = int(float(metric_match.group(1))) if metric_match else None
 
         return {"imperial": imperial, "metric": metric}
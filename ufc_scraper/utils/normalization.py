@@ -0,0 +1,126 @@
+import re
+import calendar
+from datetime import datetime
+from functools import lru_cache
+
+from .datetime_parser import DatetimeParser, EASTERN, UTC
+from .date_parser import DateParser
+from .record_parser import RecordParser
+from .measurement_parser import MeasurementParser
+from .round_parser import RoundParser
+from .odds_parser import OddsParser
+
+# Distinct raw strings remembered per normalizer. Records, odds and round summaries repeat across
+# thousands of bouts; a backfill sees far fewer distinct values than this.
+CACHE_SIZE = 4096
+
+# "Saturday 09.28.2024 at 03:00 PM ET", the event header format on Tapology
+TAPOLOGY_DATETIME = re.compile(r"(?:[A-Za-z]+\s+)?(\d{1,2})\.(\d{1,2})\.(\d{4})\s+at\s+(\d{1,2}):(\d{2})\s*([AP]M)\s+ET")
+# "1987 Jul 19" / "1990 January 15", the profile date of birth format
+TAPOLOGY_DATE = re.compile(r"(\d{4})\s+([A-Za-z]+)\s+(\d{1,2})")
+MONTHS = {
+    name.lower(): number
+    for names in (calendar.month_name, calendar.month_abbr)
+    for number, name in enumerate(names)
+    if name
+}
+
+
+class Normalizer:
+    """
+    Memoized front end to the utils parsers for values that repeat across bouts and fighters.
+
+    Tapology's known formats take a direct fast path; anything else goes to the original parser,
+    so results are identical either way. Each normalizer keeps an LRU cache of CACHE_SIZE raw
+    strings. Dict results are copied on the way out, so callers may modify what they get.
+    """
+
+    @staticmethod
+    def datetime_utc(date_time_str: str) -> str | None:
+        if not date_time_str:
+            return None
+        return _datetime_utc(date_time_str)
+
+    @staticmethod
+    def date_iso(date_str):
+        if not date_str:
+            return None
+        return _date_iso(date_str)
+
+    @staticmethod
+    def record(record_str) -> dict:
+        return dict(_record(record_str))
+
+    @staticmethod
+    def measurement(measurement_str) -> dict:
+        return dict(_measurement(measurement_str))
+
+    @staticmethod
+    def round_summary(round_summary_str: str) -> str:
+        if not round_summary_str:
+            return None
+        return _round_summary(round_summary_str)
+
+    @staticmethod
+    def odds(odds_str: str) -> dict:
+        if not odds_str or not isinstance(odds_str, str):
+            return {"odds_value": None, "odds_label": None}
+        return dict(_odds(odds_str))
+
+    @staticmethod
+    def cache_info() -> dict:
+        return {function.__name__.lstrip("_"): function.cache_info() for function in CACHED}
+
+    @staticmethod
+    def cache_clear():
+        for function in CACHED:
+            function.cache_clear()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _datetime_utc(date_time_str):
+    match = TAPOLOGY_DATETIME.fullmatch(date_time_str.strip())
+    if match:
+        month, day, year, hour, minute, meridiem = match.groups()
+        hour = int(hour) % 12 + (12 if meridiem == "PM" else 0)
+        try:
+            local = datetime(int(year), int(month), int(day), hour, int(minute), tzinfo=EASTERN)
+            return local.astimezone(UTC).isoformat()
+        except ValueError:
+            pass
+    return DatetimeParser.parse(date_time_str)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _date_iso(date_str):
+    match = TAPOLOGY_DATE.fullmatch(date_str.strip())
+    if match and match.group(2).lower() in MONTHS:
+        year, month, day = match.groups()
+        try:
+            return datetime(int(year), MONTHS[month.lower()], int(day)).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return DateParser.parse_date_to_iso(date_str)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _record(record_str):
+    return RecordParser.parse(record_str)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _measurement(measurement_str):
+    return MeasurementParser.parse_measurement(measurement_str)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _round_summary(round_summary_str):
+    return RoundParser.standardize_round_summary(round_summary_str)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _odds(odds_str):
+    return OddsParser.split_odds(odds_str)
+
+
+CACHED = (_datetime_utc, _date_iso, _record, _measurement, _round_summary, _odds)
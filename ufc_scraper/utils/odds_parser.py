@@ -1,6 +1,8 @@
 import re
 import scrapy
 
+ODDS_WITH_LABEL = re.compile(r"([+-]?\d+)\s*\(([^)]+)\)")
+
 
 class OddsParser:
 
@@ -46,7 +48,7 @@ class OddsParser:
 
         odds_str = odds_str.strip()
 
-        match = re.match(r"([+-]?\d+)\s*\(([^)]+)\)", odds_str)
+        match = ODDS_WITH_LABEL.match(odds_str)
         if match:
             value = int(match.group(1))
             label = match.group(2).strip()
@@ -1,5 +1,8 @@
 import re
 
+RECORD = re.compile(r'(\d+)-(\d+)-?(\d+)?')
+
+
 class RecordParser:
 
     @staticmethod
@@ -10,7 +13,7 @@ class RecordParser:
 
         cleaned = record_str.split(',')[0].split("(")[0].strip()
 
-        match = re.match(r'(\d+)-(\d+)-?(\d+)?', cleaned)
+        match = RECORD.match(cleaned)
 
         if not match:
             return {"wins": 0, "losses": 0, "draws": 0}
@@ -1,5 +1,10 @@
 import re
 
+TIME_FIRST = re.compile(r'^(\d{1,2}:\d{2})\s+Round\s+(\d+)', re.IGNORECASE)
+DECISION = re.compile(r'^(\d+)\s+Rounds?', re.IGNORECASE)
+NO_TIME = re.compile(r'^Round\s+(\d+)\s+of', re.IGNORECASE)
+
+
 class RoundParser:
 
     @staticmethod
@@ -9,18 +14,18 @@ class RoundParser:
 
         text = round_summary_str.strip()
 
-        match_time_first = re.search(r'^(\d{1,2}:\d{2})\s+Round\s+(\d+)', text, re.IGNORECASE)
+        match_time_first = TIME_FIRST.search(text)
         if match_time_first:
             time_str = match_time_first.group(1)
             round_num = match_time_first.group(2)
             return f"R{round_num} {time_str}"
 
-        match_decision = re.search(r'^(\d+)\s+Rounds?', text, re.IGNORECASE)
+        match_decision = DECISION.search(text)
         if match_decision:
             round_num = match_decision.group(1)
             return f"R{round_num} 5:00"
 
-        match_no_time = re.search(r'^Round\s+(\d+)\s+of', text, re.IGNORECASE)
+        match_no_time = NO_TIME.search(text)
         if match_no_time:
             round_num = match_no_time.group(1)
             return f"R{round_num} 0:00"